@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    """Класс для просмотра очереди фоновых задач"""
+    list_display = (
+        'pk',
+        'name',
+        'attempts',
+        'run_after',
+        'failed',
+        'progress',
+    )
+    list_filter = ('failed', 'name')
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Task, TaskAdmin)
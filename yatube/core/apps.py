@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+
+        # Регистрируем обработчики фоновых задач из tasks.py приложений
+        # и личные блоки страниц из holes.py
+        autodiscover_modules('tasks')
+        autodiscover_modules('holes')
@@ -0,0 +1,45 @@
+"""Учет попаданий и промахов кэша для профилировщика.
+
+ProfiledCache — обертка над настоящим кэшем, заданным алиасом в
+LOCATION, поэтому счетчики работают с любым бэкендом: LocMemCache при
+разработке, memcached или redis в проде.
+"""
+from django.core.cache import caches
+from django.utils.functional import cached_property
+
+from . import profiling
+
+
+class ProfiledCache:
+    """Кэш, сообщающий профилировщику о попаданиях и промахах."""
+
+    _missing = object()
+
+    def __init__(self, location, params):
+        self._alias = location
+
+    @cached_property
+    def backend(self):
+        return caches[self._alias]
+
+    def __getattr__(self, name):
+        # Остальные методы и атрибуты — у настоящего кэша
+        return getattr(self.backend, name)
+
+    def __contains__(self, key):
+        # Специальные методы ищутся в классе, мимо __getattr__
+        return key in self.backend
+
+    def get(self, key, default=None, version=None):
+        value = self.backend.get(key, self._missing, version)
+        if value is self._missing:
+            profiling.record_cache(0, 1)
+            return default
+        profiling.record_cache(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = self.backend.get_many(keys, version)
+        profiling.record_cache(len(values), len(keys) - len(values))
+        return values
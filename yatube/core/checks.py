@@ -0,0 +1,32 @@
+"""Проверки настроек, без которых кэш страниц отдает устаревшее."""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches)
+def check_page_cache_backend(app_configs, **kwargs):
+    """Кэш страниц требует общего для всех процессов кэша.
+
+    Версии наборов данных лежат в кэше по умолчанию: при LocMemCache
+    изменение в одном процессе не инвалидирует страницы других, и они
+    отдают устаревшее до PAGE_CACHE_TIMEOUT. В DEBUG сервер один.
+    Предупреждение, а не ошибка: с одним процессом LocMemCache
+    корректен, и настройки по умолчанию должны запускаться.
+    """
+    if settings.DEBUG or not settings.PAGE_CACHE_VIEWS:
+        return []
+    backend = caches['default']
+    # ProfiledCache только считает обращения, данные хранит его backend
+    backend = getattr(backend, 'backend', backend)
+    if not isinstance(backend, LocMemCache):
+        return []
+    return [Warning(
+        'PAGE_CACHE_VIEWS требует общего кэша, а CACHES["default"] '
+        'хранит данные в памяти процесса.',
+        hint='Укажите memcached или redis в CACHES["store"] или '
+             'отключите PAGE_CACHE_VIEWS. При одном процессе проверку '
+             'можно добавить в SILENCED_SYSTEM_CHECKS.',
+        id='core.W001',
+    )]
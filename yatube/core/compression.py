@@ -0,0 +1,164 @@
+"""Сжатие ответов: brotli, если установлен пакет brotli, иначе gzip.
+
+Сжимаются только текстовые ответы не короче COMPRESSION_MIN_SIZE и без
+своей Content-Encoding; картинки и архивы уже сжаты. Потоковые ответы
+сжимаются по частям со сбросом буфера после каждой, чтобы клиент
+получал данные без задержки. Поток событий (text/event-stream) не
+сжимается вовсе.
+
+Страницы с CSRF-токеном уязвимы для BREACH: по длине сжатого ответа
+можно подбирать секрет. COMPRESSION_BREACH_MODE задает поведение для
+них: 'pad' сжимает gzip со случайной длиной заголовка (Heal The
+Breach), 'skip' отдает их несжатыми, 'off' сжимает как обычно.
+"""
+import gzip
+import random
+import re
+import string
+import struct
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|javascript|xml)|application/[\w.+-]+\+'
+    r'(json|xml)|image/svg\+xml)')
+# Поток событий должен уходить клиенту сразу, без буфера сжатия
+SKIP_TYPES = ('text/event-stream',)
+BREACH_MAX_PADDING = 100
+PADDING_ALPHABET = (string.ascii_letters + string.digits).encode()
+
+_random = random.SystemRandom()
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещенных q=0."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+            accepted.add(coding.strip())
+    return accepted
+
+
+def random_padding():
+    return bytes(_random.choices(
+        PADDING_ALPHABET, k=_random.randint(1, BREACH_MAX_PADDING)))
+
+
+class GzipCompressor:
+    """Потоковый gzip с тем же интерфейсом, что у brotli.Compressor.
+
+    Непустой padding пишется в заголовок как имя файла: распаковщики
+    его пропускают, а длина ответа становится случайной.
+    """
+
+    def __init__(self, level, padding=b''):
+        self._deflate = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self._crc = 0
+        self._size = 0
+        flags = gzip.FNAME if padding else 0
+        # mtime=0 и ОС «неизвестна»: одинаковое содержимое, одинаковый архив
+        self._header = struct.pack('<BBBBLBB', 0x1f, 0x8b, 8, flags, 0, 0,
+                                   255)
+        if padding:
+            self._header += padding + b'\0'
+
+    def _output(self, data):
+        if self._header:
+            data, self._header = self._header + data, b''
+        return data
+
+    def process(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        return self._output(self._deflate.compress(data))
+
+    def flush(self):
+        return self._output(self._deflate.flush(zlib.Z_SYNC_FLUSH))
+
+    def finish(self):
+        return self._output(self._deflate.flush() + struct.pack(
+            '<LL', self._crc, self._size & 0xffffffff))
+
+
+def compressor(encoding, padding=b'', level=None):
+    if encoding == 'br':
+        return brotli.Compressor(
+            quality=level or settings.COMPRESSION_BROTLI_QUALITY)
+    return GzipCompressor(level or settings.COMPRESSION_GZIP_LEVEL, padding)
+
+
+def compress(content, encoding, padding=b'', level=None):
+    stream = compressor(encoding, padding, level)
+    return stream.process(content) + stream.finish()
+
+
+def compress_sequence(chunks, encoding, padding=b''):
+    stream = compressor(encoding, padding)
+    for chunk in chunks:
+        data = stream.process(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+def choose_encoding(request, allow_brotli=True):
+    accepted = accepted_encodings(
+        request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if allow_brotli and brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '')
+    if (response.has_header('Content-Encoding')
+            or response.status_code == 206
+            or content_type.startswith(SKIP_TYPES)
+            or not COMPRESSIBLE_TYPES.match(content_type)):
+        return False
+    return (response.streaming
+            or len(response.content) >= settings.COMPRESSION_MIN_SIZE)
+
+
+def compress_response(request, response):
+    """Сжимает ответ кодировкой, которую понимает клиент."""
+    if not is_compressible(response):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    # Токен в странице: get_token() отмечает это в request.META
+    mode = settings.COMPRESSION_BREACH_MODE
+    breach = bool(request.META.get('CSRF_COOKIE_USED')) and mode != 'off'
+    if breach and mode == 'skip':
+        return response
+    # Случайную длину дает заголовок gzip, у brotli такого поля нет
+    encoding = choose_encoding(request, allow_brotli=not breach)
+    if encoding is None:
+        return response
+    padding = random_padding() if breach else b''
+    if response.streaming:
+        response.streaming_content = compress_sequence(
+            response.streaming_content, encoding, padding)
+        del response['Content-Length']
+    else:
+        compressed = compress(response.content, encoding, padding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+    # Сжатое тело отличается побайтно, сильный ETag становится слабым
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    response['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,108 @@
+"""Удаление из CSS правил для классов, которых нет в шаблонах.
+
+Классы собираются из атрибутов class в шаблонах, из фильтра addclass
+и из строк class/className в скриптах и тегах. Правило остается, если
+хотя бы одному его селектору хватает найденных классов; правила без
+классов (элементы, :root) и @-правила без селекторов не трогаются.
+"""
+import re
+
+TEMPLATE_TAG = re.compile(r'{%.*?%}|{{.*?}}', re.S)
+ADDCLASS = re.compile(r'''addclass:\s*["']([^"']*)["']''')
+CLASS_ATTR = re.compile(r'''class(?:Name)?\s*=\s*["']([^"'{}]*)["']''')
+SELECTOR_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+NOT_PSEUDO = re.compile(r':not\([^)]*\)')
+GROUPING_AT_RULES = ('@media', '@supports')
+
+
+def collect_classes(texts):
+    """Множество CSS-классов, встречающихся в текстах шаблонов и кода."""
+    classes = set()
+    for text in texts:
+        for value in ADDCLASS.findall(text):
+            classes.update(value.split())
+        for value in CLASS_ATTR.findall(TEMPLATE_TAG.sub(' ', text)):
+            classes.update(value.split())
+    return classes
+
+
+def split_rules(css):
+    """Делит CSS на пары (заголовок, тело) верхнего уровня.
+
+    У комментариев и инструкций вроде @charset тело равно None.
+    """
+    rules = []
+    position = 0
+    while position < len(css):
+        if css.startswith('/*', position):
+            end = css.index('*/', position) + 2
+            rules.append((css[position:end], None))
+            position = end
+            continue
+        brace = css.find('{', position)
+        semicolon = css.find(';', position)
+        if brace == -1:
+            tail = css[position:].strip()
+            if tail:
+                rules.append((tail, None))
+            break
+        if semicolon != -1 and semicolon < brace:
+            rules.append((css[position:semicolon + 1].strip(), None))
+            position = semicolon + 1
+            continue
+        depth = 0
+        end = brace
+        while True:
+            if css[end] == '{':
+                depth += 1
+            elif css[end] == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+        rules.append((css[position:brace].strip(), css[brace + 1:end]))
+        position = end + 1
+    return rules
+
+
+def split_selectors(prelude):
+    selectors = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(prelude):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:index])
+            start = index + 1
+    selectors.append(prelude[start:])
+    return selectors
+
+
+def is_used(selector, classes):
+    # Классы внутри :not() не обязаны встречаться в шаблонах
+    required = SELECTOR_CLASS.findall(NOT_PSEUDO.sub('', selector))
+    return all(name in classes for name in required)
+
+
+def purge(css, classes):
+    kept = []
+    for prelude, body in split_rules(css):
+        if body is None:
+            # Лицензию и @charset сохраняем, прочие комментарии нет
+            if prelude.startswith(('/*!', '@')):
+                kept.append(prelude)
+        elif prelude.startswith(GROUPING_AT_RULES):
+            inner = purge(body, classes)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            kept.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [selector for selector in split_selectors(prelude)
+                         if is_used(selector, classes)]
+            if selectors:
+                kept.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(kept)
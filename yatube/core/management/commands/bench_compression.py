@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from core import compression
+from posts.models import Post
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (4, 5, 11)
+
+
+class Command(BaseCommand):
+    help = ('Замер сжатия страниц: размер и время сжатия одного ответа '
+            'для уровней gzip и brotli.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*')
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def default_paths(self):
+        paths = [reverse('posts:index')]
+        post = Post.objects.order_by('-pk').first()
+        if post is not None:
+            paths.append(reverse('posts:post_detail', args=(post.pk,)))
+        return paths
+
+    def variants(self):
+        for level in GZIP_LEVELS:
+            yield f'gzip-{level}', 'gzip', level
+        if compression.brotli is None:
+            self.stdout.write('brotli не установлен, замер только gzip')
+            return
+        for quality in BROTLI_QUALITIES:
+            yield f'br-{quality}', 'br', quality
+
+    def handle(self, *args, **options):
+        client = Client()
+        iterations = options['iterations']
+        variants = list(self.variants())
+        for path in options['paths'] or self.default_paths():
+            # Без Accept-Encoding ответ приходит несжатым
+            content = client.get(path).content
+            self.stdout.write(f'{path}: {len(content)} байт')
+            for label, encoding, level in variants:
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    compressed = compression.compress(
+                        content, encoding, level=level)
+                per_response = (time.perf_counter() - started) / iterations
+                saved = 100 * (1 - len(compressed) / len(content))
+                self.stdout.write(
+                    f'    {label:<8} {len(compressed):>8} байт '
+                    f'(-{saved:.1f}%) {per_response * 1000:.3f} мс')
@@ -0,0 +1,80 @@
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import Engine, RequestContext, engines
+from django.test import RequestFactory
+
+from core import profiling
+from core.template_loaders import TIMED_LOADERS
+from posts.models import Group, Post
+
+User = get_user_model()
+BENCH_POSTS = 10
+
+
+class Command(BaseCommand):
+    help = 'Замер рендеринга главной страницы с 10 постами по шаблонам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def make_engine(self, cached):
+        configured = engines['django'].engine
+        loaders = TIMED_LOADERS
+        if cached:
+            loaders = [('core.template_loaders.CachedLoader', loaders)]
+        return Engine(
+            dirs=configured.dirs,
+            loaders=loaders,
+            context_processors=configured.context_processors,
+            libraries=configured.libraries,
+        )
+
+    def make_context(self):
+        # Посты не сохраняются: замеряется только рендеринг, без запросов
+        author = User(username='bench_author')
+        group = Group(title='Bench group', slug='bench-group')
+        posts = [
+            Post(id=number, text='Текст поста ' * 20,
+                 author=author, group=group)
+            for number in range(1, BENCH_POSTS + 1)
+        ]
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        page_obj = Paginator(posts, BENCH_POSTS).get_page(1)
+        return request, {'page_obj': page_obj, 'index': True}
+
+    def bench(self, engine, iterations):
+        request, context = self.make_context()
+        template = engine.get_template('posts/index.html')
+        fragment_key = make_template_fragment_key('index')
+        totals = defaultdict(float)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            cache.delete(fragment_key)
+            profile = profiling.start()
+            template.render(RequestContext(request, context))
+            for name, seconds in profile.templates.items():
+                totals[name] += seconds
+        profiling._local.profile = None
+        elapsed = time.perf_counter() - started
+        return elapsed / iterations, totals
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        for cached in (False, True):
+            per_render, totals = self.bench(
+                self.make_engine(cached), iterations)
+            loader = 'cached' if cached else 'uncached'
+            self.stdout.write(
+                f'{loader}: {per_render * 1000:.2f} мс на рендеринг')
+            for name, seconds in sorted(
+                    totals.items(), key=lambda item: -item[1]):
+                self.stdout.write(
+                    f'    {name:<40} {seconds / iterations * 1000:.3f} мс')
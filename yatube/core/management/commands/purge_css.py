@@ -0,0 +1,45 @@
+import glob
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.css_purge import collect_classes, purge
+
+CSS_SOURCE = 'css/bootstrap.min.css'
+CSS_TARGET = 'css/bootstrap.purged.min.css'
+# Кроме шаблонов классы задаются в скриптах и в тегах шаблонов
+CLASS_SOURCES = ('**/static/**/*.js', '**/templatetags/*.py')
+
+
+class Command(BaseCommand):
+    help = (f'Собирает {CSS_TARGET}: Bootstrap без правил для классов, '
+            'которых нет в шаблонах.')
+
+    def add_arguments(self, parser):
+        static_dir = settings.STATICFILES_DIRS[0]
+        parser.add_argument(
+            '--source', default=os.path.join(static_dir, CSS_SOURCE))
+        parser.add_argument(
+            '--output', default=os.path.join(static_dir, CSS_TARGET))
+
+    def handle(self, *args, **options):
+        paths = glob.glob(
+            os.path.join(settings.TEMPLATES_DIR, '**', '*.html'),
+            recursive=True)
+        for pattern in CLASS_SOURCES:
+            paths += glob.glob(
+                os.path.join(settings.BASE_DIR, pattern), recursive=True)
+        texts = []
+        for path in paths:
+            with open(path, encoding='utf-8') as source:
+                texts.append(source.read())
+        classes = collect_classes(texts)
+        with open(options['source'], encoding='utf-8') as source:
+            css = source.read()
+        purged = purge(css, classes)
+        with open(options['output'], 'w', encoding='utf-8') as target:
+            target.write(purged)
+        self.stdout.write(
+            f'Классов в шаблонах: {len(classes)}; '
+            f'{len(css)} -> {len(purged)} байт.')
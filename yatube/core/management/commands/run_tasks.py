@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.tasks import TASK_BATCH_SIZE, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Фоновый обработчик очереди задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и завершиться.')
+        parser.add_argument(
+            '--batch-size', type=int, default=TASK_BATCH_SIZE)
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.')
+
+    def handle(self, *args, **options):
+        while True:
+            done = run_pending(options['batch_size'])
+            if done:
+                self.stdout.write(f'Выполнено задач: {done}')
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
@@ -0,0 +1,94 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import compression, page_cache, profiling
+
+
+class ProfilingMiddleware:
+    """Профилирует долю запросов, заданную PROFILING_SAMPLE_RATE."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+        profiling.start()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(profiling.sql_wrapper))
+            response = self.get_response(request)
+        match = request.resolver_match
+        profiling.finish(match.view_name if match else 'unresolved',
+                         time.perf_counter() - started)
+        return response
+
+
+class CompressionMiddleware:
+    """Сжимает текстовые ответы brotli или gzip.
+
+    Стоит перед кэшем страниц: в кэше лежит несжатый текст, а сжимаются
+    и страницы из кэша, и ответы view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return compression.compress_response(
+            request, self.get_response(request))
+
+
+class AnonymousPageCacheMiddleware:
+    """Отдает анонимам закэшированные страницы.
+
+    Стоит до сессий и авторизации: запрос без куки сессии при попадании
+    в кэш не доходит ни до них, ни до view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if page_cache.has_session(request):
+            return self.get_response(request)
+        key = page_cache.page_key(request)
+        if key is None:
+            return self.get_response(request)
+        page = page_cache.get_page(key)
+        if page is not None:
+            page_cache.run_hit_hooks(request)
+            return page_cache.build_response(page, 'hit')
+        response = self.get_response(request)
+        if page_cache.is_cacheable(response):
+            page_cache.store_page(key, response)
+            response['X-Page-Cache'] = 'miss'
+        return response
+
+
+class PunchedPageCacheMiddleware:
+    """Отдает пользователю с сессией страницу анонима с его блоками.
+
+    Стоит после авторизации; перерисовываются только блоки {% hole %}.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (settings.PAGE_CACHE_PUNCH
+                and page_cache.has_session(request)):
+            return self.get_response(request)
+        key = page_cache.page_key(request)
+        page = page_cache.get_page(key) if key else None
+        if page is None:
+            return self.get_response(request)
+        page_cache.run_hit_hooks(request)
+        return page_cache.build_response(
+            page, 'punched', page_cache.punch(request, page[1]))
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='progress',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+    ]
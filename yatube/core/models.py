@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Модель отложенных задач фонового обработчика"""
+    name = models.CharField(max_length=100)
+    payload = models.TextField(default='{}')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    failed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True)
+    # Ход выполнения долгой задачи, см. core.tasks.report_progress
+    progress = models.CharField(max_length=200, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['run_after', 'pk']
+        indexes = [
+            models.Index(fields=['failed', 'run_after'],
+                         name='task_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
@@ -0,0 +1,129 @@
+"""Кэш целых страниц для анонимов с «дырами» под личные блоки.
+
+Страница кэшируется один раз, в том виде, в каком ее видит аноним.
+Личные блоки шаблонов (шапка с пользователем, форма комментария,
+кнопки подписки) выводятся тегом {% hole %}, который оставляет вокруг
+блока маркеры. Вошедшему пользователю отдается та же закэшированная
+страница, в которой заново рендерятся только блоки между маркерами.
+
+Ключ страницы зависит от пути с параметрами и от версий наборов
+данных из settings.PAGE_CACHE_VIEWS, поэтому изменение постов,
+комментариев или подписок делает старые страницы недостижимыми.
+"""
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, QueryDict
+from django.template.loader import render_to_string
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+from django.utils.http import urlencode
+from django.utils.safestring import mark_safe
+
+from . import versions
+
+PAGE_CACHE_TIMEOUT = 60 * 10
+HOLE_PATTERN = re.compile(
+    r'<!--hole:(?P<name>\w+)\?(?P<args>[^>]*)-->.*?<!--/hole-->', re.S)
+
+_holes = {}
+_hit_hooks = {}
+
+
+def hole(name, template_name):
+    """Регистрирует личный блок страницы.
+
+    Декорируемая функция получает request и аргументы тега строками
+    и возвращает дополнительный контекст шаблона блока.
+    """
+    def decorator(func):
+        _holes[name] = (template_name, func)
+        return func
+    return decorator
+
+
+def on_hit(view_name):
+    """Регистрирует функцию, которую нужно вызвать вместо view.
+
+    Страница из кэша отдается без вызова view; функция получает request
+    и аргументы адреса, например чтобы учесть просмотр.
+    """
+    def decorator(func):
+        _hit_hooks.setdefault(view_name, []).append(func)
+        return func
+    return decorator
+
+
+def run_hit_hooks(request):
+    match = request.resolver_match
+    for func in _hit_hooks.get(match.view_name, ()):
+        func(request, *match.args, **match.kwargs)
+
+
+def render_hole(request, name, args):
+    template_name, get_context = _holes[name]
+    html = render_to_string(
+        template_name, get_context(request, **args), request=request)
+    return mark_safe(
+        f'<!--hole:{name}?{urlencode(args)}-->{html}<!--/hole-->')
+
+
+def punch(request, content):
+    """Перерисовывает личные блоки закэшированной страницы."""
+    def replace(match):
+        args = QueryDict(match.group('args')).dict()
+        return render_hole(request, match.group('name'), args)
+    return HOLE_PATTERN.sub(replace, content)
+
+
+def has_session(request):
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def page_key(request):
+    """Ключ страницы или None, если ее view не кэшируется."""
+    if request.method != 'GET':
+        return None
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+    stamps = settings.PAGE_CACHE_VIEWS.get(match.view_name)
+    if stamps is None:
+        return None
+    request.resolver_match = match
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return versions.versioned_key(f'page:{path}', *stamps)
+
+
+def is_cacheable(response):
+    # Куки в ответе (например, csrftoken) значат, что страница личная
+    return (response.status_code == 200
+            and not response.streaming
+            and not response.cookies)
+
+
+def store_page(key, response):
+    cache.set(
+        key,
+        (response['Content-Type'], response.content.decode(response.charset)),
+        PAGE_CACHE_TIMEOUT,
+    )
+
+
+def get_page(key):
+    """Пара (Content-Type, текст) из кэша или None."""
+    return cache.get(key)
+
+
+def build_response(page, status, content=None):
+    content_type, cached_content = page
+    response = HttpResponse(
+        cached_content if content is None else content,
+        content_type=content_type,
+    )
+    response['X-Page-Cache'] = status
+    patch_vary_headers(response, ('Cookie',))
+    return response
@@ -0,0 +1,176 @@
+"""Выборочное профилирование запросов.
+
+Метрики одного запроса копятся в thread-local ``RequestProfile``,
+по завершении запроса сводятся в гистограммы процесса, а те
+периодически сбрасываются в JSON-файл процесса в PROFILING_STORE_DIR.
+Эндпоинт /metrics складывает файлы всех процессов.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+
+# Границы корзин гистограмм, в миллисекундах
+BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+METRICS = (
+    ('wall', 'view'),
+    ('sql', 'view'),
+    ('template', 'view'),
+    ('template_self', 'template'),
+)
+COUNTERS = ('requests', 'sql_queries', 'cache_hits', 'cache_misses')
+
+_local = threading.local()
+_lock = threading.Lock()
+_histograms = defaultdict(lambda: [0] * (len(BUCKETS) + 3))
+_counters = defaultdict(int)
+_last_flush = time.monotonic()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.sql_queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        # Время детей для каждого шаблона, рендерящегося сейчас
+        self.template_stack = []
+        # Собственное время шаблонов без вложенных include
+        self.templates = defaultdict(float)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+def start():
+    _local.profile = RequestProfile()
+    return _local.profile
+
+
+def current():
+    return getattr(_local, 'profile', None)
+
+
+def sql_wrapper(execute, sql, params, many, context):
+    """Обертка для connection.execute_wrapper: считает запросы и время."""
+    profile = current()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if profile is not None:
+            profile.sql_queries += 1
+            profile.sql_time += time.perf_counter() - started
+
+
+def record_cache(hits, misses):
+    profile = current()
+    if profile is not None:
+        profile.cache_hits += hits
+        profile.cache_misses += misses
+
+
+def _observe(key, seconds):
+    # Последние две ячейки — число наблюдений и сумма в миллисекундах
+    value = seconds * 1000
+    histogram = _histograms[key]
+    histogram[bisect_left(BUCKETS, value)] += 1
+    histogram[-2] += 1
+    histogram[-1] += value
+
+
+def finish(view_name, wall_time):
+    profile = current()
+    _local.profile = None
+    if profile is None:
+        return
+    with _lock:
+        _observe((view_name, 'wall'), wall_time)
+        _observe((view_name, 'sql'), profile.sql_time)
+        _observe((view_name, 'template'), profile.template_time)
+        for template_name, seconds in profile.templates.items():
+            _observe((template_name, 'template_self'), seconds)
+        _counters[(view_name, 'requests')] += 1
+        _counters[(view_name, 'sql_queries')] += profile.sql_queries
+        _counters[(view_name, 'cache_hits')] += profile.cache_hits
+        _counters[(view_name, 'cache_misses')] += profile.cache_misses
+    maybe_flush()
+
+
+def snapshot():
+    with _lock:
+        return {
+            'histograms': [[*key, list(value)]
+                           for key, value in _histograms.items()],
+            'counters': [[*key, value] for key, value in _counters.items()],
+        }
+
+
+def _store_path(pid):
+    return os.path.join(settings.PROFILING_STORE_DIR, f'{pid}.json')
+
+
+def flush():
+    global _last_flush
+    _last_flush = time.monotonic()
+    os.makedirs(settings.PROFILING_STORE_DIR, exist_ok=True)
+    path = _store_path(os.getpid())
+    with open(f'{path}.tmp', 'w') as store:
+        json.dump(snapshot(), store)
+    os.replace(f'{path}.tmp', path)
+
+
+def maybe_flush():
+    if time.monotonic() - _last_flush >= settings.PROFILING_FLUSH_INTERVAL:
+        flush()
+
+
+def collect():
+    """Складывает метрики всех процессов из локального хранилища."""
+    flush()
+    histograms = defaultdict(lambda: [0] * (len(BUCKETS) + 3))
+    counters = defaultdict(int)
+    for name in os.listdir(settings.PROFILING_STORE_DIR):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(settings.PROFILING_STORE_DIR, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for view_name, metric, values in data['histograms']:
+            merged = histograms[(view_name, metric)]
+            for index, value in enumerate(values):
+                merged[index] += value
+        for view_name, counter, value in data['counters']:
+            counters[(view_name, counter)] += value
+    return histograms, counters
+
+
+def render_prometheus():
+    histograms, counters = collect()
+    lines = []
+    for metric, label in METRICS:
+        name = f'yatube_{metric}_milliseconds'
+        lines.append(f'# TYPE {name} histogram')
+        for (subject, key), values in sorted(histograms.items()):
+            if key != metric:
+                continue
+            total = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), values):
+                total += count
+                lines.append(
+                    f'{name}_bucket{{{label}="{subject}",le="{bound}"}} '
+                    f'{total}')
+            lines.append(f'{name}_count{{{label}="{subject}"}} {values[-2]}')
+            lines.append(
+                f'{name}_sum{{{label}="{subject}"}} {values[-1]:.3f}')
+    for counter in COUNTERS:
+        name = f'yatube_{counter}_total'
+        lines.append(f'# TYPE {name} counter')
+        for (view_name, key), value in sorted(counters.items()):
+            if key == counter:
+                lines.append(f'{name}{{view="{view_name}"}} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,59 @@
+"""Локальная публикация событий для долгих соединений (SSE).
+
+Событие не несет данных: подписчик узнает, что тема изменилась, и сам
+перечитывает базу. Подписчики в том же процессе просыпаются сразу;
+процессы не связаны между собой, поэтому подписчик должен ждать с
+таймаутом и после него тоже проверять базу.
+"""
+import threading
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_topics = {}
+
+
+class _Topic:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.subscribers = 0
+
+
+class Subscription:
+    def __init__(self, topic):
+        self._topic = topic
+        self._seen = topic.sequence
+
+    def wait(self, timeout):
+        """Ждет публикации; True, если она была с прошлого вызова."""
+        topic = self._topic
+        with topic.condition:
+            if topic.sequence == self._seen:
+                topic.condition.wait(timeout)
+            published = topic.sequence != self._seen
+            self._seen = topic.sequence
+        return published
+
+
+@contextmanager
+def subscribe(name):
+    with _lock:
+        topic = _topics.setdefault(name, _Topic())
+        topic.subscribers += 1
+    try:
+        yield Subscription(topic)
+    finally:
+        with _lock:
+            topic.subscribers -= 1
+            if not topic.subscribers:
+                del _topics[name]
+
+
+def publish(name):
+    with _lock:
+        topic = _topics.get(name)
+    if topic is None:
+        return
+    with topic.condition:
+        topic.sequence += 1
+        topic.condition.notify_all()
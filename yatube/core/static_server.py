@@ -0,0 +1,103 @@
+"""Раздача собранной статики на уровне WSGI, до Django.
+
+Файлы STATIC_ROOT индексируются один раз при старте, поэтому запрос не
+делает ни поиска по диску, ни разбора пути: адрес либо есть в
+индексе, либо запрос уходит в приложение. Клиенту отдается самый
+короткий из понятных ему вариантов (.br, .gz или исходный файл).
+Файлы с хэшем в имени кэшируются браузером навсегда.
+"""
+import mimetypes
+import os
+import re
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+
+from .compression import accepted_encodings
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+# Имя вида bootstrap.0123456789ab.css от ManifestStaticFilesStorage
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class StaticFile:
+    def __init__(self, url, path):
+        content_type, _ = mimetypes.guess_type(path)
+        self.content_type = content_type or 'application/octet-stream'
+        self.cache_control = (IMMUTABLE_CACHE_CONTROL
+                              if HASHED_NAME.search(url)
+                              else DEFAULT_CACHE_CONTROL)
+        # Варианты от лучшего к исходному: (кодировка, путь, размер, etag)
+        self.variants = []
+        for encoding, suffix in ENCODINGS:
+            if os.path.isfile(path + suffix):
+                self.variants.append(self._variant(encoding, path + suffix))
+        self.variants.append(self._variant(None, path))
+
+    @staticmethod
+    def _variant(encoding, path):
+        stat = os.stat(path)
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}-{encoding or "id"}"'
+        return encoding, path, stat.st_size, etag
+
+    def choose(self, accept_encoding):
+        accepted = accepted_encodings(accept_encoding)
+        for variant in self.variants:
+            if variant[0] is None or variant[0] in accepted:
+                return variant
+
+    def headers(self, encoding, size, etag):
+        headers = [
+            ('Content-Type', self.content_type),
+            ('Cache-Control', self.cache_control),
+            ('ETag', etag),
+        ]
+        if len(self.variants) > 1:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        return headers, ('Content-Length', str(size))
+
+
+class StaticFilesApp:
+    """WSGI-обертка, отдающая файлы STATIC_ROOT по адресам STATIC_URL."""
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.root = root or getattr(settings, 'STATIC_ROOT', None)
+        self.prefix = prefix or settings.STATIC_URL
+        self.files = self.scan()
+
+    def scan(self):
+        files = {}
+        if not self.root or not os.path.isdir(self.root):
+            return files
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(('.gz', '.br')):
+                    continue
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                url = self.prefix + name
+                files[url] = StaticFile(url, path)
+        return files
+
+    def __call__(self, environ, start_response):
+        static_file = self.files.get(environ.get('PATH_INFO', ''))
+        method = environ.get('REQUEST_METHOD')
+        if static_file is None or method not in ('GET', 'HEAD'):
+            return self.application(environ, start_response)
+        encoding, path, size, etag = static_file.choose(
+            environ.get('HTTP_ACCEPT_ENCODING', ''))
+        headers, content_length = static_file.headers(encoding, size, etag)
+        if environ.get('HTTP_IF_NONE_MATCH') == etag:
+            start_response('304 Not Modified', headers)
+            return []
+        start_response('200 OK', headers + [content_length])
+        if method == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(path, 'rb'), FILE_CHUNK_SIZE)
@@ -0,0 +1,56 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.json', '.xml',
+                           '.ico', '.html')
+MIN_COMPRESS_SIZE = 512
+
+
+def _gzip(content):
+    # mtime=0: одинаковый файл дает одинаковый архив при каждой сборке
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def _brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэшированные имена и заранее сжатые варианты .gz и .br.
+
+    Варианты пишутся рядом с хэшированными файлами при collectstatic,
+    только для текстовых форматов и только если они меньше оригинала.
+    Brotli используется, если установлен пакет brotli.
+    """
+
+    def post_process(self, *args, **kwargs):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+                *args, **kwargs):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        for hashed_name in hashed_names:
+            self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as source:
+            content = source.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        compressors = [('.gz', _gzip)]
+        if brotli is not None:
+            compressors.append(('.br', _brotli))
+        for suffix, compress in compressors:
+            compressed = compress(content)
+            if len(compressed) < len(content):
+                with open(self.path(name + suffix), 'wb') as target:
+                    target.write(compressed)
@@ -0,0 +1,144 @@
+"""Очередь фоновых задач на таблице в основной базе.
+
+Задачи ставятся в очередь через ``enqueue`` после коммита транзакции
+и выполняются командой ``run_tasks``. Обработчики регистрируются
+декоратором ``task`` в модулях ``tasks.py`` приложений.
+"""
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+TASK_MAX_ATTEMPTS = 5
+TASK_LEASE_SECONDS = 300
+TASK_BATCH_SIZE = 100
+
+_handlers = {}
+_running = threading.local()
+
+
+def task(name, batch=False, max_attempts=TASK_MAX_ATTEMPTS):
+    """Регистрирует обработчик задачи.
+
+    Пакетный обработчик (batch=True) получает список payload всех
+    однотипных задач из выборки и вызывается один раз.
+    """
+    def decorator(func):
+        _handlers[name] = (func, batch, max_attempts)
+        return func
+    return decorator
+
+
+def enqueue(name, **payload):
+    """Ставит задачу в очередь после успешного коммита транзакции."""
+    if getattr(settings, 'TASKS_ALWAYS_EAGER', False):
+        transaction.on_commit(lambda: _call(name, [payload]))
+        return
+    transaction.on_commit(lambda: Task.objects.create(
+        name=name, payload=json.dumps(payload, default=str)))
+
+
+@contextmanager
+def _running_tasks(task_ids):
+    _running.task_ids = task_ids
+    try:
+        yield
+    finally:
+        _running.task_ids = []
+
+
+def report_progress(text):
+    """Сохраняет ход выполнения текущей задачи и продлевает ее аренду.
+
+    Ход виден в админке. Долгий обработчик, сообщающий о ходе после
+    каждой пачки, не теряет задачу через TASK_LEASE_SECONDS: иначе ее
+    взял бы и запустил параллельно другой обработчик. Вне run_tasks
+    (синхронный вызов, TASKS_ALWAYS_EAGER) ничего не делает.
+    """
+    task_ids = getattr(_running, 'task_ids', None)
+    if task_ids:
+        Task.objects.filter(pk__in=task_ids).update(
+            progress=text[:200],
+            run_after=timezone.now() + timedelta(
+                seconds=TASK_LEASE_SECONDS),
+        )
+
+
+def _call(name, payloads, task_ids=None):
+    func, batch, _ = _handlers[name]
+    task_ids = task_ids or [None] * len(payloads)
+    if batch:
+        with _running_tasks([pk for pk in task_ids if pk]):
+            func(payloads)
+    else:
+        for payload, task_id in zip(payloads, task_ids):
+            with _running_tasks([task_id] if task_id else []):
+                func(**payload)
+
+
+def _claim(limit):
+    """Забирает готовые задачи, откладывая их на время аренды.
+
+    Так задачу не возьмет другой обработчик, а если текущий упадет,
+    она вернется в очередь по истечении аренды. Задача считается
+    своей, только если условный UPDATE по прежнему run_after изменил
+    строку: SQLite не поддерживает SELECT ... FOR UPDATE SKIP LOCKED,
+    а так два обработчика не получат одну задачу ни на какой базе.
+    """
+    now = timezone.now()
+    lease = now + timedelta(seconds=TASK_LEASE_SECONDS)
+    candidates = Task.objects.filter(
+        failed=False, run_after__lte=now)[:limit]
+    claimed = []
+    for task_obj in candidates:
+        if Task.objects.filter(
+                pk=task_obj.pk, failed=False,
+                run_after=task_obj.run_after,
+        ).update(run_after=lease):
+            task_obj.run_after = lease
+            claimed.append(task_obj)
+    return claimed
+
+
+def _fail(tasks, error):
+    now = timezone.now()
+    for task_obj in tasks:
+        task_obj.attempts += 1
+        max_attempts = _handlers.get(
+            task_obj.name, (None, None, 1))[2]
+        task_obj.failed = task_obj.attempts >= max_attempts
+        task_obj.run_after = now + timedelta(seconds=2 ** task_obj.attempts)
+        task_obj.last_error = error
+    Task.objects.bulk_update(
+        tasks, ['attempts', 'failed', 'run_after', 'last_error'])
+
+
+def run_pending(limit=TASK_BATCH_SIZE):
+    """Выполняет одну выборку задач и возвращает их количество."""
+    tasks = _claim(limit)
+    by_name = defaultdict(list)
+    for task_obj in tasks:
+        by_name[task_obj.name].append(task_obj)
+    for name, group in by_name.items():
+        if name not in _handlers:
+            _fail(group, f'Неизвестная задача {name}')
+            continue
+        try:
+            _call(name, [json.loads(t.payload) for t in group],
+                  [t.pk for t in group])
+        except Exception as error:
+            logger.exception('Задача %s завершилась ошибкой', name)
+            _fail(group, repr(error))
+        else:
+            Task.objects.filter(pk__in=[t.pk for t in group]).delete()
+    return len(tasks)
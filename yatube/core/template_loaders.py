@@ -0,0 +1,59 @@
+"""Загрузчики шаблонов, замеряющие время рендеринга для профилировщика."""
+import time
+
+from django.template.base import Template
+from django.template.loaders import app_directories, cached, filesystem
+
+from . import profiling
+
+
+class TimedTemplate(Template):
+    """Шаблон, сообщающий профилировщику свое собственное время.
+
+    Время вложенных include вычитается из времени родителя, так что по
+    метрикам видно, какой именно фрагмент дорог. Родитель из extends
+    рендерится в рамках потомка и учитывается в его времени.
+    """
+
+    def render(self, context):
+        profile = profiling.current()
+        if profile is None:
+            return super().render(context)
+        stack = profile.template_stack
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return super().render(context)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = stack.pop()
+            profile.templates[self.name] += elapsed - children
+            if stack:
+                stack[-1] += elapsed
+            else:
+                profile.template_time += elapsed
+
+
+TIMED_LOADERS = [
+    'core.template_loaders.FilesystemLoader',
+    'core.template_loaders.AppDirectoriesLoader',
+]
+
+
+class TimedLoaderMixin:
+    def get_template(self, template_name, skip=None):
+        template = super().get_template(template_name, skip)
+        template.__class__ = TimedTemplate
+        return template
+
+
+class FilesystemLoader(TimedLoaderMixin, filesystem.Loader):
+    pass
+
+
+class AppDirectoriesLoader(TimedLoaderMixin, app_directories.Loader):
+    pass
+
+
+class CachedLoader(TimedLoaderMixin, cached.Loader):
+    """Кэширующий загрузчик; скомпилированные шаблоны тоже замеряются."""
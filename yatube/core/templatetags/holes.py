@@ -0,0 +1,17 @@
+from django import template
+
+from .. import page_cache
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, **kwargs):
+    """Личный блок страницы, который кэш страниц перерисует сам.
+
+    Аргументы передаются строками, как и при перерисовке из кэша;
+    пустые значения отбрасываются.
+    """
+    args = {key: str(value) for key, value in kwargs.items()
+            if value not in (None, False, '')}
+    return page_cache.render_hole(context['request'], name, args)
@@ -0,0 +1,14 @@
+from django.test.runner import DiscoverRunner, default_test_processes
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """Запускает тесты во всех ядрах, если --parallel не задан.
+
+    Каждый процесс работает со своей копией тестовой базы SQLite в
+    памяти; число процессов можно задать в DJANGO_TEST_PROCESSES.
+    """
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(parallel=default_test_processes())
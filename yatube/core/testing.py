@@ -0,0 +1,16 @@
+"""Общие заготовки для тестов приложений."""
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+IMAGE_CONTENT_TYPES = {'GIF': 'image/gif', 'PNG': 'image/png',
+                       'JPEG': 'image/jpeg'}
+
+
+def small_image(name='small.gif', size=(2, 2), image_format='GIF'):
+    """Загружаемая картинка в несколько десятков байт."""
+    file_obj = BytesIO()
+    Image.new('RGB', size, (255, 0, 0)).save(file_obj, image_format)
+    return SimpleUploadedFile(
+        name, file_obj.getvalue(), IMAGE_CONTENT_TYPES[image_format])
@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase, override_settings
+
+from ..checks import check_page_cache_backend
+
+
+class PageCacheBackendCheckTest(SimpleTestCase):
+    @override_settings(DEBUG=False)
+    def test_process_local_cache_reported(self):
+        warnings = check_page_cache_backend(None)
+        self.assertEqual([warning.id for warning in warnings],
+                         ['core.W001'])
+
+    @override_settings(DEBUG=False, PAGE_CACHE_VIEWS={})
+    def test_passes_without_page_cache(self):
+        self.assertEqual(check_page_cache_backend(None), [])
+
+    @override_settings(DEBUG=True)
+    def test_passes_in_debug(self):
+        self.assertEqual(check_page_cache_backend(None), [])
@@ -0,0 +1,79 @@
+import gzip
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .. import compression
+from ..middleware import CompressionMiddleware
+
+HTML = '<div class="card"><p>Текст поста</p></div>' * 100
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def respond(self, view, accept_encoding='gzip'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(view)(request)
+
+    def test_html_compressed_with_gzip(self):
+        response = self.respond(lambda request: HttpResponse(HTML))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(
+            gzip.decompress(response.content).decode(), HTML)
+        self.assertEqual(
+            response['Content-Length'], str(len(response.content)))
+
+    def test_skipped_responses(self):
+        """Короткие, бинарные ответы и поток событий не сжимаются."""
+        views = (
+            lambda request: HttpResponse('<p>мало</p>'),
+            lambda request: HttpResponse(
+                b'\xff' * 5000, content_type='image/jpeg'),
+            lambda request: StreamingHttpResponse(
+                iter(['data: 1\n\n']), content_type='text/event-stream'),
+        )
+        for view in views:
+            with self.subTest(view=view):
+                response = self.respond(view)
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_no_accept_encoding(self):
+        response = self.respond(lambda request: HttpResponse(HTML), '')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_streaming_response_compressed_by_chunks(self):
+        response = self.respond(
+            lambda request: StreamingHttpResponse(iter([HTML, HTML])))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        content = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(content).decode(), HTML * 2)
+
+    def csrf_view(self, request):
+        get_token(request)
+        return HttpResponse(HTML)
+
+    def test_breach_padding_for_csrf_pages(self):
+        """Длина страницы с токеном меняется от ответа к ответу."""
+        lengths = set()
+        for _ in range(10):
+            response = self.respond(self.csrf_view, 'gzip, br')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(
+                gzip.decompress(response.content).decode(), HTML)
+            lengths.add(len(response.content))
+        self.assertGreater(len(lengths), 1)
+
+    @override_settings(COMPRESSION_BREACH_MODE='skip')
+    def test_breach_skip_mode(self):
+        response = self.respond(self.csrf_view)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_accepted_encodings(self):
+        self.assertEqual(
+            compression.accepted_encodings('gzip;q=0, br;q=0.5, deflate'),
+            {'br', 'deflate'})
@@ -0,0 +1,85 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template import Engine
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import profiling
+from ..template_loaders import TIMED_LOADERS, TimedTemplate
+
+
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.store_dir = tempfile.mkdtemp(prefix='yatube-test-profiling-')
+        cls.profiling_settings = override_settings(
+            PROFILING_SAMPLE_RATE=1.0, PROFILING_STORE_DIR=cls.store_dir)
+        cls.profiling_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.profiling_settings.disable()
+        shutil.rmtree(cls.store_dir, ignore_errors=True)
+
+    def test_metrics_collected_for_sampled_requests(self):
+        """Время, SQL, шаблоны и кэш попадают в /metrics."""
+        self.client.get('/')
+        response = self.client.get('/metrics')
+        metrics = response.content.decode()
+        self.assertIn(
+            'yatube_wall_milliseconds_count{view="posts:index"}', metrics)
+        self.assertIn(
+            'yatube_template_milliseconds_count{view="posts:index"}',
+            metrics)
+        self.assertIn(
+            'yatube_sql_queries_total{view="posts:index"}', metrics)
+        self.assertIn(
+            'yatube_cache_misses_total{view="posts:index"}', metrics)
+
+    def test_include_self_time_collected(self):
+        """Собственное время include видно отдельно от страницы."""
+        self.client.get('/')
+        metrics = profiling.render_prometheus()
+        self.assertIn('yatube_template_self_milliseconds_count'
+                      '{template="includes/header.html"}', metrics)
+
+    def test_cached_loader_keeps_timing(self):
+        """Кэширующий загрузчик отдает замеряемые шаблоны."""
+        engine = Engine(
+            dirs=[settings.TEMPLATES_DIR],
+            loaders=[('core.template_loaders.CachedLoader',
+                      TIMED_LOADERS)],
+        )
+        template = engine.get_template('includes/footer.html')
+        self.assertIsInstance(template, TimedTemplate)
+        self.assertIs(engine.get_template('includes/footer.html'), template)
+
+    def test_histogram_buckets(self):
+        """Наблюдение попадает в первую подходящую корзину."""
+        profiling._observe(('test', 'wall'), 0.003)
+        histogram = profiling._histograms[('test', 'wall')]
+        self.assertEqual(histogram[profiling.BUCKETS.index(5)], 1)
+        self.assertEqual(histogram[-2], 1)
+
+
+class ProfiledCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_hits_and_misses_counted_over_any_backend(self):
+        """Обращения считает обертка, данные хранит настоящий кэш."""
+        cache.set('present', 1)
+        with mock.patch.object(profiling, 'record_cache') as record:
+            self.assertEqual(cache.get('present'), 1)
+            self.assertIsNone(cache.get('absent'))
+            self.assertEqual(cache.get_many(['present', 'absent']),
+                             {'present': 1})
+        self.assertEqual(
+            [call.args for call in record.call_args_list],
+            [(1, 0), (0, 1), (1, 1)])
+        self.assertEqual(cache.incr('present'), 2)
@@ -0,0 +1,29 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from .. import pubsub
+
+
+class PubSubTest(SimpleTestCase):
+    def test_publish_wakes_subscriber(self):
+        woken = []
+        subscribed = threading.Event()
+
+        def listen():
+            with pubsub.subscribe('topic') as subscription:
+                subscribed.set()
+                woken.append(subscription.wait(5))
+
+        listener = threading.Thread(target=listen)
+        listener.start()
+        subscribed.wait(5)
+        pubsub.publish('topic')
+        listener.join(5)
+        self.assertEqual(woken, [True])
+        self.assertNotIn('topic', pubsub._topics)
+
+    def test_wait_times_out_without_publish(self):
+        with pubsub.subscribe('topic') as subscription:
+            pubsub.publish('other')
+            self.assertFalse(subscription.wait(0.01))
@@ -0,0 +1,79 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from ..css_purge import collect_classes, purge
+from ..static_server import (DEFAULT_CACHE_CONTROL, IMMUTABLE_CACHE_CONTROL,
+                             StaticFilesApp)
+
+CSS = ('/*! license */.btn{color:red}.unused{color:blue}'
+       'a:not(.btn){x:y}@media (min-width:1px){.card{a:b}.nav{c:d}}')
+
+
+class CssPurgeTest(SimpleTestCase):
+    def test_unused_rules_removed(self):
+        """Остаются правила для классов из шаблонов и лицензия."""
+        classes = collect_classes(
+            ['<div class="btn {% if x %}y{% endif %}">', 'class="card"'])
+        purged = purge(CSS, classes)
+        self.assertEqual(
+            purged,
+            '/*! license */.btn{color:red}a:not(.btn){x:y}'
+            '@media (min-width:1px){.card{a:b}}')
+
+
+class StaticFilesAppTest(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        content = b'body{}' * 200
+        with open(os.path.join(self.root, 'app.0123456789ab.css'),
+                  'wb') as target:
+            target.write(content)
+        with open(os.path.join(self.root, 'app.0123456789ab.css.gz'),
+                  'wb') as target:
+            target.write(gzip.compress(content))
+        with open(os.path.join(self.root, 'app.css'), 'wb') as target:
+            target.write(content)
+        self.app = StaticFilesApp(self.fallback, self.root, '/static/')
+
+    @staticmethod
+    def fallback(environ, start_response):
+        start_response('404 Not Found', [])
+        return [b'django']
+
+    def request(self, path, **environ):
+        result = {}
+
+        def start_response(status, headers):
+            result['status'] = status
+            result['headers'] = dict(headers)
+
+        body = b''.join(self.app(
+            dict(REQUEST_METHOD='GET', PATH_INFO=path, **environ),
+            start_response))
+        return result['status'], result['headers'], body
+
+    def test_gzip_variant_for_hashed_file(self):
+        status, headers, body = self.request(
+            '/static/app.0123456789ab.css', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(gzip.decompress(body), b'body{}' * 200)
+
+    def test_identity_and_revalidation(self):
+        status, headers, _ = self.request('/static/app.0123456789ab.css')
+        self.assertNotIn('Content-Encoding', headers)
+        status, _, _ = self.request(
+            '/static/app.0123456789ab.css', HTTP_IF_NONE_MATCH=headers['ETag'])
+        self.assertEqual(status, '304 Not Modified')
+        _, headers, _ = self.request('/static/app.css')
+        self.assertEqual(headers['Cache-Control'], DEFAULT_CACHE_CONTROL)
+
+    def test_unknown_path_goes_to_application(self):
+        _, _, body = self.request('/static/missing.css')
+        self.assertEqual(body, b'django')
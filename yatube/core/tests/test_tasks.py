@@ -0,0 +1,102 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Task
+from .. import tasks
+from ..tasks import report_progress, run_pending, task
+
+calls = []
+
+
+@task('tests.collect', batch=True)
+def collect(payloads):
+    calls.append(sorted(payload['value'] for payload in payloads))
+
+
+@task('tests.broken', max_attempts=2)
+def broken(**payload):
+    raise ValueError('broken')
+
+
+@task('tests.halfway')
+def halfway(**payload):
+    report_progress('обработана половина')
+    raise ValueError('halfway')
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def test_batch_handler_called_once(self):
+        """Однотипные задачи обрабатываются одним вызовом."""
+        Task.objects.create(name='tests.collect', payload='{"value": 2}')
+        Task.objects.create(name='tests.collect', payload='{"value": 1}')
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(calls, [[1, 2]])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failed_task_is_retried(self):
+        """Упавшая задача откладывается, а после лимита помечается."""
+        broken_task = Task.objects.create(name='tests.broken')
+        run_pending()
+        broken_task.refresh_from_db()
+        self.assertEqual(broken_task.attempts, 1)
+        self.assertFalse(broken_task.failed)
+        Task.objects.update(run_after=broken_task.created)
+        run_pending()
+        broken_task.refresh_from_db()
+        self.assertTrue(broken_task.failed)
+        self.assertIn('broken', broken_task.last_error)
+
+    def test_task_claimed_once_by_racing_workers(self):
+        """Задачу, выбранную двумя обработчиками, получает только один."""
+        Task.objects.create(name='tests.collect', payload='{"value": 1}')
+        real_filter = Task.objects.filter
+        other_worker = []
+
+        def racing_filter(*args, **kwargs):
+            queryset = real_filter(*args, **kwargs)
+            if 'run_after__lte' in kwargs and not other_worker:
+                # Первый обработчик уже выбрал строки, второй успел раньше
+                selected = list(queryset)
+                other_worker.append(None)
+                other_worker[0] = tasks._claim(10)
+                return selected
+            return queryset
+
+        with mock.patch.object(Task.objects, 'filter',
+                               side_effect=racing_filter):
+            claimed = tasks._claim(10)
+        self.assertEqual(len(other_worker[0]), 1)
+        self.assertEqual(claimed, [])
+
+    def test_progress_renews_lease(self):
+        """Сообщение о ходе продлевает аренду долгой задачи."""
+        halfway_task = Task.objects.create(name='tests.halfway')
+        claimed_at = timezone.now()
+        reported_at = claimed_at + timedelta(hours=1)
+        with mock.patch.object(tasks, '_fail'), \
+                mock.patch.object(tasks.timezone, 'now',
+                                  side_effect=[claimed_at, reported_at]):
+            run_pending()
+        halfway_task.refresh_from_db()
+        self.assertEqual(
+            halfway_task.run_after,
+            reported_at + timedelta(seconds=tasks.TASK_LEASE_SECONDS))
+
+    def test_progress_saved_on_task(self):
+        """Ход выполнения остается в строке задачи и после сбоя."""
+        halfway_task = Task.objects.create(name='tests.halfway')
+        other_task = Task.objects.create(name='tests.collect',
+                                         payload='{"value": 1}')
+        run_pending()
+        halfway_task.refresh_from_db()
+        self.assertEqual(halfway_task.progress, 'обработана половина')
+        self.assertFalse(Task.objects.filter(pk=other_task.pk).exists())
+        report_progress('вне задачи')
+        halfway_task.refresh_from_db()
+        self.assertEqual(halfway_task.progress, 'обработана половина')
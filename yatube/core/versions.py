@@ -0,0 +1,49 @@
+"""Версии наборов данных для инвалидации кэша.
+
+Ключ закэшированного значения включает номер версии набора, от
+которого оно зависит. Изменение данных увеличивает номер, и старые
+ключи перестают читаться, не требуя перебора и удаления.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _key(name):
+    return f'version:{name}'
+
+
+def _initial():
+    # После вытеснения из кэша версия не должна повторить старую
+    return int(time.time() * 1000)
+
+
+def get_versions(*names):
+    """Текущие версии наборов одним обращением к кэшу."""
+    keys = [_key(name) for name in names]
+    versions = cache.get_many(keys)
+    missing = {key: _initial() for key in keys if key not in versions}
+    for key, version in missing.items():
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+        versions[key] = version
+    return [versions[key] for key in keys]
+
+
+def get_version(name):
+    return get_versions(name)[0]
+
+
+def bump(*names):
+    """Объявляет наборы измененными."""
+    for name in names:
+        try:
+            cache.incr(_key(name))
+        except ValueError:
+            cache.add(_key(name), _initial(), None)
+
+
+def versioned_key(key, *names):
+    """Ключ кэша, устаревающий при изменении любого из наборов."""
+    versions = '.'.join(str(version) for version in get_versions(*names))
+    return f'{key}:v{versions}'
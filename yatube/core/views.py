@@ -1,5 +1,9 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render
 
+from . import profiling
+
 
 def page_not_found(request, exception):
     return render(request, 'core/404.html', {'path': request.path}, status=404)
@@ -11,3 +15,11 @@ def access_denied(request, reason=''):
 
 def server_error(request):
     return render(request, 'core/500.html', {'path': request.path}, status=500)
+
+
+def metrics(request):
+    if (not request.user.is_staff
+            and request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS):
+        return HttpResponseForbidden()
+    return HttpResponse(profiling.render_prometheus(),
+                        content_type='text/plain; version=0.0.4')
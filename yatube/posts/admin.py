@@ -1,8 +1,70 @@
-from django.contrib import admin
-from .models import Post, Group
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.urls import reverse
+from django.utils.html import format_html
 
+from . import moderation
+from .models import Comment, Group, Post
+from .paginators import EstimatedCountPaginator
 
-class PostAdmin(admin.ModelAdmin):
+
+class GroupActionForm(ActionForm):
+    """Форма действий с выбором группы для переноса постов."""
+    group = forms.ModelChoiceField(
+        Group.objects.all(),
+        required=False,
+        label='Группа',
+        widget=AutocompleteSelect(
+            Post._meta.get_field('group').remote_field, admin.site),
+    )
+
+
+class ModerationMixin:
+    """Массовые действия через moderation без загрузки объектов."""
+
+    def get_actions(self, request):
+        # Штатное удаление строит объекты для страницы подтверждения
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def run_moderation(self, request, operation, count, message, **kwargs):
+        done = moderation.run(operation, count, **kwargs)
+        if done is None:
+            tasks_url = reverse('admin:core_task_changelist')
+            self.message_user(
+                request,
+                format_html(
+                    'Операция над {} записями поставлена в очередь, ход '
+                    'выполнения — в <a href="{}?name=posts.moderation">'
+                    'списке задач</a>.', count, tasks_url),
+                messages.WARNING,
+            )
+        else:
+            self.message_user(request, f'{message}: {done}.')
+
+    @staticmethod
+    def selection(request, queryset, ids_name):
+        """Число строк и аргументы операции для выбранных строк.
+
+        При «выбрать все» операции передается запрос списка, а не id:
+        на большой таблице их список занял бы память и строку задачи.
+        """
+        if request.POST.get('select_across') == '1':
+            return queryset.count(), {
+                'query': moderation.dump_query(queryset)}
+        ids = list(queryset.values_list('pk', flat=True))
+        return len(ids), {ids_name: ids}
+
+    @staticmethod
+    def selected_authors(queryset):
+        return list(queryset.order_by().values_list(
+            'author_id', flat=True).distinct())
+
+
+class PostAdmin(ModerationMixin, admin.ModelAdmin):
     """Класс для администрирования ресурса"""
     list_display = (
         'pk',
@@ -11,11 +73,100 @@ class PostAdmin(admin.ModelAdmin):
         'author',
         'group',
     )
-    list_editable = ('group',)
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('author', 'group')
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = GroupActionForm
+    actions = (
+        'delete_posts',
+        'delete_author_posts',
+        'move_posts',
+        'move_group_posts',
+    )
+
+    def delete_posts(self, request, queryset):
+        count, selected = self.selection(request, queryset, 'post_ids')
+        self.run_moderation(request, 'delete_posts', count,
+                            'Удалено постов', **selected)
+    delete_posts.short_description = 'Удалить выбранные посты'
+
+    def delete_author_posts(self, request, queryset):
+        author_ids = self.selected_authors(queryset)
+        count = Post.objects.filter(author_id__in=author_ids).count()
+        self.run_moderation(request, 'delete_posts', count,
+                            'Удалено постов', author_ids=author_ids)
+    delete_author_posts.short_description = 'Удалить все посты авторов'
+
+    def target_group(self, request):
+        group = GroupActionForm(request.POST).fields['group'].clean(
+            request.POST.get('group'))
+        if group is None:
+            self.message_user(request, 'Выберите группу для переноса.',
+                              messages.ERROR)
+        return group
+
+    def move_posts(self, request, queryset):
+        group = self.target_group(request)
+        if group is None:
+            return
+        count, selected = self.selection(request, queryset, 'post_ids')
+        self.run_moderation(request, 'move_posts', count,
+                            'Перенесено постов', to_group_id=group.pk,
+                            **selected)
+    move_posts.short_description = 'Перенести выбранные посты в группу'
+
+    def move_group_posts(self, request, queryset):
+        group = self.target_group(request)
+        if group is None:
+            return
+        group_ids = list(queryset.exclude(group=None).order_by().values_list(
+            'group_id', flat=True).distinct())
+        count = Post.objects.filter(group_id__in=group_ids).count()
+        self.run_moderation(request, 'move_posts', count,
+                            'Перенесено постов', to_group_id=group.pk,
+                            from_group_ids=group_ids)
+    move_group_posts.short_description = (
+        'Перенести все посты их групп в группу')
+
+
+class CommentAdmin(ModerationMixin, admin.ModelAdmin):
+    list_display = ('pk', 'text', 'pub_date', 'author', 'post')
+    search_fields = ('text',)
+    empty_value_display = '-пусто-'
+    list_select_related = ('author', 'post')
+    autocomplete_fields = ('author',)
+    raw_id_fields = ('post',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ('delete_comments', 'delete_author_comments')
+
+    def delete_comments(self, request, queryset):
+        count, selected = self.selection(request, queryset, 'comment_ids')
+        self.run_moderation(request, 'delete_comments', count,
+                            'Удалено комментариев', **selected)
+    delete_comments.short_description = 'Удалить выбранные комментарии'
+
+    def delete_author_comments(self, request, queryset):
+        author_ids = self.selected_authors(queryset)
+        count = Comment.objects.filter(author_id__in=author_ids).count()
+        self.run_moderation(request, 'delete_comments', count,
+                            'Удалено комментариев', author_ids=author_ids)
+    delete_author_comments.short_description = (
+        'Удалить все комментарии авторов')
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug')
+    search_fields = ('title', 'slug')
+    ordering = ('title',)
 
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(Group, GroupAdmin)
@@ -0,0 +1,96 @@
+import json
+import zipfile
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment
+
+EXPORT_CHUNK_SIZE = 2000
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipStream:
+    """Файлоподобный буфер, из которого забираются готовые куски архива.
+
+    Объект не поддерживает seek/tell, поэтому zipfile пишет архив
+    последовательно, с дескрипторами данных после каждого файла.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _dump(record):
+    return (json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder)
+            + '\n').encode()
+
+
+def iter_ndjson(author, chunk_size=EXPORT_CHUNK_SIZE):
+    """Построчно отдает посты и комментарии автора в формате NDJSON."""
+    posts = author.posts.order_by('pk').values(
+        'id', 'text', 'pub_date', 'group__slug', 'image',
+    )
+    for post in posts.iterator(chunk_size=chunk_size):
+        yield _dump({
+            'type': 'post',
+            'id': post['id'],
+            'text': post['text'],
+            'pub_date': post['pub_date'],
+            'group': post['group__slug'],
+            'image': post['image'] or None,
+        })
+    comments = Comment.objects.filter(author=author).order_by('pk').values(
+        'id', 'post_id', 'text', 'pub_date',
+    )
+    for comment in comments.iterator(chunk_size=chunk_size):
+        yield _dump({
+            'type': 'comment',
+            'id': comment['id'],
+            'post': comment['post_id'],
+            'text': comment['text'],
+            'pub_date': comment['pub_date'],
+        })
+
+
+def iter_zip(author, chunk_size=EXPORT_CHUNK_SIZE):
+    """Отдает zip-архив с NDJSON-выгрузкой и картинками постов по частям."""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open('export.ndjson', 'w', force_zip64=True) as entry:
+            for line in iter_ndjson(author, chunk_size):
+                entry.write(line)
+                data = stream.pop()
+                if data:
+                    yield data
+        images = author.posts.exclude(image='').order_by('pk').values_list(
+            'image', flat=True)
+        for name in images.iterator(chunk_size=chunk_size):
+            if not default_storage.exists(name):
+                continue
+            with default_storage.open(name) as source, archive.open(
+                    f'images/{name}', 'w', force_zip64=True) as target:
+                for chunk in iter(lambda: source.read(FILE_CHUNK_SIZE), b''):
+                    target.write(chunk)
+                    data = stream.pop()
+                    if data:
+                        yield data
+    yield stream.pop()
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson', 'ndjson'),
+    'zip': (iter_zip, 'application/zip', 'zip'),
+}
@@ -0,0 +1,151 @@
+"""Лента подписок слиянием отсортированных потоков авторов.
+
+Для каждого автора в кэше хранится ограниченный список ключей его
+последних постов ``(pub_date в микросекундах, id)`` по убыванию.
+Страница ленты собирается k-путевым слиянием этих списков через heapq,
+поэтому ее стоимость зависит от размера страницы, а не от общего числа
+постов авторов. Холодные авторы и авторы, чьих закэшированных постов
+не хватает до конца страницы, дочитываются одним SQL-запросом.
+"""
+import heapq
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from core.tasks import enqueue
+from .models import Post
+from .paginators import POSTS_ON_PAGE
+
+AUTHOR_STREAM_SIZE = 50
+AUTHOR_STREAM_TIMEOUT = 60 * 60 * 24
+# С какого числа подписок follow_index переходит на слияние потоков
+FEED_MERGE_THRESHOLD = 50
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def _stream_key(author_id):
+    return f'feed:author:{author_id}'
+
+
+def _timestamp(pub_date):
+    return (pub_date - EPOCH) // MICROSECOND
+
+
+def post_key(post):
+    return _timestamp(post.pub_date), post.id
+
+
+def encode_cursor(key):
+    return f'{key[0]}_{key[1]}'
+
+
+def decode_cursor(value):
+    try:
+        timestamp, post_id = value.split('_')
+        return int(timestamp), int(post_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _key_filter(cursor):
+    """Условие «пост строго старше курсора» для SQL-запроса."""
+    timestamp, post_id = cursor
+    pub_date = EPOCH + timestamp * MICROSECOND
+    return Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=post_id)
+
+
+def _sql_stream(author_ids, cursor, limit):
+    posts = Post.objects.filter(author_id__in=author_ids)
+    if cursor is not None:
+        posts = posts.filter(_key_filter(cursor))
+    posts = posts.order_by('-pub_date', '-id').values_list(
+        'pub_date', 'id')[:limit]
+    return [(_timestamp(pub_date), post_id) for pub_date, post_id in posts]
+
+
+def load_author_stream(author_id):
+    stream = _sql_stream([author_id], None, AUTHOR_STREAM_SIZE)
+    cache.set(_stream_key(author_id), stream, AUTHOR_STREAM_TIMEOUT)
+    return stream
+
+
+def push_post(post):
+    """Добавляет новый пост в начало закэшированного потока автора."""
+    key = _stream_key(post.author_id)
+    stream = cache.get(key)
+    if stream is None:
+        return
+    stream = sorted({*stream, post_key(post)}, reverse=True)
+    cache.set(key, stream[:AUTHOR_STREAM_SIZE], AUTHOR_STREAM_TIMEOUT)
+
+
+def invalidate_authors(author_ids):
+    cache.delete_many([_stream_key(author_id) for author_id in author_ids])
+
+
+class FeedPage:
+    """Страница ленты с курсорной навигацией вместо номеров страниц."""
+
+    def __init__(self, posts, next_cursor, is_first):
+        self.object_list = posts
+        self.next_cursor = next_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or not self.is_first
+
+
+def get_feed_page(author_ids, cursor=None, page_size=POSTS_ON_PAGE):
+    author_ids = list(author_ids)
+    cached = cache.get_many([_stream_key(pk) for pk in author_ids])
+    streams = []
+    sql_authors = []
+    cold_authors = []
+    for author_id in author_ids:
+        stream = cached.get(_stream_key(author_id))
+        if stream is None:
+            cold_authors.append(author_id)
+            continue
+        if cursor is not None:
+            stream = [key for key in stream if key < cursor]
+        # Полный список мог обрезать старые посты: если их не хватит
+        # на страницу, автор дочитывается из базы
+        if (len(cached[_stream_key(author_id)]) >= AUTHOR_STREAM_SIZE
+                and len(stream) <= page_size):
+            sql_authors.append(author_id)
+        elif stream:
+            streams.append(stream)
+    if cold_authors:
+        enqueue('posts.warm_author_streams', author_ids=cold_authors)
+    sql_authors += cold_authors
+    if sql_authors:
+        streams.append(_sql_stream(sql_authors, cursor, page_size + 1))
+    merged = list(islice(heapq.merge(*streams, reverse=True),
+                         page_size + 1))
+    page_keys = merged[:page_size]
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        [post_id for _, post_id in page_keys])
+    next_cursor = None
+    if len(merged) > page_size:
+        next_cursor = encode_cursor(page_keys[-1])
+    return FeedPage(
+        [posts[post_id] for _, post_id in page_keys if post_id in posts],
+        next_cursor,
+        cursor is None,
+    )
@@ -0,0 +1,102 @@
+"""Кэш графа подписок.
+
+Для каждого пользователя в кэше лежит множество id авторов, на которых
+он подписан, и число его подписчиков. Множество меняет только сам
+пользователь через follow/unfollow, поэтому кэш обновляется на месте,
+без повторного чтения таблицы Follow.
+"""
+from django.core.cache import cache
+
+from core import versions
+from .models import Follow
+
+FOLLOW_CACHE_TIMEOUT = 60 * 60
+# Версия для кэша страниц, см. PAGE_CACHE_VIEWS
+FOLLOWS_VERSION = 'follows'
+
+
+def _followees_key(user_id):
+    return f'follow:followees:{user_id}'
+
+
+def _followers_count_key(author_id):
+    return f'follow:followers_count:{author_id}'
+
+
+def get_followees(user_id):
+    """Множество id авторов, на которых подписан пользователь."""
+    key = _followees_key(user_id)
+    followees = cache.get(key)
+    if followees is None:
+        followees = frozenset(Follow.objects.filter(
+            user_id=user_id).values_list('author_id', flat=True))
+        cache.set(key, followees, FOLLOW_CACHE_TIMEOUT)
+    return followees
+
+
+def get_followers_count(author_id):
+    key = _followers_count_key(author_id)
+    count = cache.get(key)
+    if count is None:
+        count = Follow.objects.filter(author_id=author_id).count()
+        cache.set(key, count, FOLLOW_CACHE_TIMEOUT)
+    return count
+
+
+def followees_for(user):
+    """Множество подписок пользователя, запомненное на объекте user.
+
+    Сколько бы авторов ни проверялось при рендеринге страницы, кэш
+    читается один раз за запрос.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    if not hasattr(user, '_followees'):
+        user._followees = get_followees(user.id)
+    return user._followees
+
+
+def is_following(user, author_id):
+    return author_id in followees_for(user)
+
+
+def following_map(user, author_ids):
+    """Состояние подписки сразу для всех авторов страницы."""
+    followees = followees_for(user)
+    return {author_id: author_id in followees for author_id in author_ids}
+
+
+def _change_followers_count(author_id, delta):
+    try:
+        cache.incr(_followers_count_key(author_id), delta)
+    except ValueError:
+        # Счетчика нет в кэше — он будет посчитан при следующем чтении
+        pass
+
+
+def follow(user_id, author_id):
+    _, created = Follow.objects.get_or_create(
+        user_id=user_id,
+        author_id=author_id,
+    )
+    if created:
+        cache.set(_followees_key(user_id),
+                  get_followees(user_id) | {author_id},
+                  FOLLOW_CACHE_TIMEOUT)
+        _change_followers_count(author_id, 1)
+        versions.bump(FOLLOWS_VERSION)
+    return created
+
+
+def unfollow(user_id, author_id):
+    deleted, _ = Follow.objects.filter(
+        user_id=user_id,
+        author_id=author_id,
+    ).delete()
+    if deleted:
+        cache.set(_followees_key(user_id),
+                  get_followees(user_id) - {author_id},
+                  FOLLOW_CACHE_TIMEOUT)
+        _change_followers_count(author_id, -1)
+        versions.bump(FOLLOWS_VERSION)
+    return bool(deleted)
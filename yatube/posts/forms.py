@@ -1,5 +1,6 @@
 from django import forms
 from .models import Post, Comment
+from .widgets import GroupAutocomplete
 
 
 class PostForm(forms.ModelForm):
@@ -12,6 +13,7 @@ class PostForm(forms.ModelForm):
         help_texts = {'text': '* Пост не может быть пустым',
                       'group': 'Группа, к которой будет относиться пост',
                       }
+        widgets = {'group': GroupAutocomplete}
 
     def clean_text(self):
         text = self.cleaned_data['text']
@@ -0,0 +1,46 @@
+"""Закэшированный список групп для выбора в формах.
+
+Список хранится под версионным ключом и сбрасывается сигналами при
+изменении групп. Форма рендерит только выбранную группу, остальные
+подгружаются поиском через group_autocomplete; полный список остается
+только в <noscript> для браузеров без JavaScript.
+"""
+from django.core.cache import cache
+
+from core import versions
+from .models import Group
+
+GROUPS_VERSION = 'groups'
+GROUP_CHOICES_TIMEOUT = 60 * 60 * 24
+AUTOCOMPLETE_LIMIT = 20
+
+
+def group_choices():
+    """Пары (id, название) всех групп, отсортированные по названию."""
+    key = versions.versioned_key('group_choices', GROUPS_VERSION)
+    choices = cache.get(key)
+    if choices is None:
+        choices = list(Group.objects.order_by('title').values_list(
+            'pk', 'title'))
+        cache.set(key, choices, GROUP_CHOICES_TIMEOUT)
+    return choices
+
+
+def search_groups(query, limit=AUTOCOMPLETE_LIMIT):
+    query = query.strip().lower()
+    found = []
+    for pk, title in group_choices():
+        if query in title.lower():
+            found.append((pk, title))
+            if len(found) == limit:
+                break
+    return found
+
+
+def groups_version():
+    """Версия списка групп, например для ключа кэша фрагмента формы."""
+    return versions.get_version(GROUPS_VERSION)
+
+
+def groups_changed():
+    versions.bump(GROUPS_VERSION)
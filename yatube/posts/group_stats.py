@@ -0,0 +1,83 @@
+"""Агрегаты каталога сообществ.
+
+Число постов и время последней публикации обновляются инкрементально
+при создании, удалении и переносе постов. Топ авторов меняется
+медленно и пересчитывается периодически командой refresh_group_stats.
+"""
+import json
+from collections import defaultdict
+
+from django.db.models import Count, F, Max
+
+from .models import Group, GroupStats, Post
+
+TOP_AUTHORS = 3
+
+
+def post_added(group_id, pub_date, count=1):
+    if group_id is None:
+        return
+    stats, created = GroupStats.objects.get_or_create(
+        group_id=group_id,
+        defaults={'posts_count': count, 'last_post_at': pub_date},
+    )
+    if not created:
+        GroupStats.objects.filter(group_id=group_id).update(
+            posts_count=F('posts_count') + count)
+        GroupStats.objects.filter(group_id=group_id).exclude(
+            last_post_at__gte=pub_date).update(last_post_at=pub_date)
+
+
+def post_removed(group_id):
+    if group_id is None:
+        return
+    GroupStats.objects.filter(group_id=group_id, posts_count__gt=0).update(
+        posts_count=F('posts_count') - 1)
+
+
+def posts_added(posts):
+    """Учитывает пачку постов, созданных без сигналов (bulk_create)."""
+    counts = defaultdict(int)
+    last_dates = {}
+    for post in posts:
+        counts[post.group_id] += 1
+        last_dates[post.group_id] = max(
+            post.pub_date, last_dates.get(post.group_id, post.pub_date))
+    for group_id, count in counts.items():
+        post_added(group_id, last_dates[group_id], count)
+
+
+def post_moved(old_group_id, new_group_id, pub_date):
+    if old_group_id != new_group_id:
+        post_removed(old_group_id)
+        post_added(new_group_id, pub_date)
+
+
+def refresh(group_ids=None):
+    """Полный пересчет агрегатов (всех или только указанных групп)."""
+    groups = Group.objects.all()
+    posts = Post.objects.exclude(group=None)
+    if group_ids is not None:
+        groups = groups.filter(pk__in=group_ids)
+        posts = posts.filter(group_id__in=group_ids)
+    totals = {
+        row['group']: row for row in posts.order_by().values('group')
+        .annotate(posts_count=Count('id'), last_post_at=Max('pub_date'))
+    }
+    top_authors = defaultdict(list)
+    by_author = posts.order_by().values('group', 'author__username').annotate(
+        count=Count('id')).order_by('group', '-count', 'author__username')
+    for row in by_author.iterator():
+        if len(top_authors[row['group']]) < TOP_AUTHORS:
+            top_authors[row['group']].append(row['author__username'])
+    for group_id in groups.values_list('pk', flat=True).iterator():
+        row = totals.get(group_id, {})
+        GroupStats.objects.update_or_create(
+            group_id=group_id,
+            defaults={
+                'posts_count': row.get('posts_count', 0),
+                'last_post_at': row.get('last_post_at'),
+                'top_authors': json.dumps(top_authors[group_id],
+                                          ensure_ascii=False),
+            },
+        )
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+
+from core import versions
+from core.page_cache import PAGE_CACHE_TIMEOUT, hole
+from . import follow_graph
+from .forms import CommentForm
+from .models import Comment
+from .recommendations import recommended_authors
+from .signals import COMMENTS_VERSION
+
+
+@hole('switcher', 'posts/includes/switcher.html')
+def switcher(request, **flags):
+    return flags
+
+
+@hole('post_actions', 'posts/includes/post_actions.html')
+def post_actions(request, post_id, author_id):
+    return {'post_id': post_id, 'is_author': int(author_id) == request.user.id}
+
+
+@hole('comment_form', 'posts/includes/comment_form.html')
+def comment_form(request, post_id):
+    return {'post_id': post_id, 'form': CommentForm()}
+
+
+@hole('comments', 'posts/includes/comments.html')
+def comments(request, post_id):
+    # Один блок на весь список: кнопки подписки на авторов комментариев
+    # рисуются в нем по подпискам, прочитанным один раз за запрос.
+    # Сами комментарии кэшируются, как и страница, до их изменения
+    key = versions.versioned_key(f'comments:{post_id}', COMMENTS_VERSION)
+    comments = cache.get(key)
+    if comments is None:
+        comments = list(Comment.objects.filter(
+            post_id=post_id).select_related('author').order_by('id'))
+        cache.set(key, comments, PAGE_CACHE_TIMEOUT)
+    return {'comments': comments}
+
+
+@hole('profile_follow', 'posts/includes/profile_follow.html')
+def profile_follow(request, author_id, username):
+    return {
+        'username': username,
+        'following': follow_graph.is_following(request.user, int(author_id)),
+    }
+
+
+@hole('recommendations', 'posts/includes/recommendations.html')
+def recommendations(request):
+    return {'recommended_authors': recommended_authors(request.user)}
@@ -0,0 +1,116 @@
+"""Поток новых комментариев поста в формате Server-Sent Events.
+
+add_comment публикует событие темы поста, поток просыпается и
+отправляет комментарии с id больше последнего отправленного. Между
+публикациями поток раз в LIVE_COMMENTS_POLL_INTERVAL секунд сам
+проверяет базу (комментарии из других процессов) и шлет ping, чтобы
+прокси не закрыли соединение. Через LIVE_COMMENTS_TIMEOUT поток
+закрывается и освобождает обработчик, а EventSource переподключается
+с заголовком Last-Event-ID.
+
+Открытый поток держит обработчик и соединение с базой, поэтому
+сервер нужен с потоками или асинхронными воркерами (gunicorn
+--worker-class gthread или gevent), а число потоков в процессе
+ограничено LIVE_COMMENTS_MAX_STREAMS. Сверх лимита ответ отдает
+накопленные комментарии и сразу закрывается, а клиент переподключается
+реже: поток превращается в опрос.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from core import pubsub
+from .models import Comment
+
+RECONNECT_MILLISECONDS = 3000
+FALLBACK_RECONNECT_MILLISECONDS = 15000
+LIVE_COMMENTS_BATCH = 50
+
+_streams_lock = threading.Lock()
+_open_streams = 0
+
+
+def comments_topic(post_id):
+    return f'comments:{post_id}'
+
+
+def publish_comment(comment):
+    pubsub.publish(comments_topic(comment.post_id))
+
+
+def _event(request, comment):
+    data = json.dumps({
+        'id': comment.id,
+        'html': render_to_string(
+            'posts/includes/comment.html', {'comment': comment},
+            request=request),
+    })
+    return f'id: {comment.id}\nevent: comment\ndata: {data}\n\n'
+
+
+def comment_events(request, post_id, last_id, timeout=None,
+                   retry=RECONNECT_MILLISECONDS):
+    if timeout is None:
+        timeout = settings.LIVE_COMMENTS_TIMEOUT
+    deadline = time.monotonic() + timeout
+    # Подписка до первого запроса: публикация между ними не потеряется
+    with pubsub.subscribe(comments_topic(post_id)) as subscription:
+        yield f'retry: {retry}\n\n'
+        while True:
+            comments = list(Comment.objects.filter(
+                post_id=post_id, id__gt=last_id,
+            ).select_related('author').order_by('id')[:LIVE_COMMENTS_BATCH])
+            for comment in comments:
+                last_id = comment.id
+                yield _event(request, comment)
+            if len(comments) == LIVE_COMMENTS_BATCH:
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not subscription.wait(
+                    min(remaining, settings.LIVE_COMMENTS_POLL_INTERVAL)):
+                yield ': ping\n\n'
+
+
+def _release_stream():
+    global _open_streams
+    with _streams_lock:
+        _open_streams -= 1
+
+
+class _CommentStream:
+    """Поток событий, занимающий место в лимите процесса до закрытия.
+
+    Ответ закрывает его и тогда, когда клиент ушел до первого события
+    и генератор даже не начинал работу.
+    """
+
+    def __init__(self, events):
+        self._events = events
+        self._open = True
+
+    def __iter__(self):
+        return self._events
+
+    def close(self):
+        if self._open:
+            self._open = False
+            _release_stream()
+        self._events.close()
+
+
+def open_stream(request, post_id, last_id):
+    """Поток комментариев или разовый ответ, если лимит потоков занят."""
+    global _open_streams
+    with _streams_lock:
+        available = _open_streams < settings.LIVE_COMMENTS_MAX_STREAMS
+        if available:
+            _open_streams += 1
+    if not available:
+        return comment_events(request, post_id, last_id, timeout=0,
+                              retry=FALLBACK_RECONNECT_MILLISECONDS)
+    return _CommentStream(comment_events(request, post_id, last_id))
@@ -0,0 +1,42 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.importer import (IMPORT_BATCH_SIZE, READERS, Checkpoint,
+                            PostImporter)
+
+
+class Command(BaseCommand):
+    help = 'Импорт постов из NDJSON или CSV с продолжением после сбоя.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=sorted(READERS),
+            help='По умолчанию определяется по расширению файла.')
+        parser.add_argument(
+            '--media-dir', help='Каталог с картинками постов.')
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'Файл {path} не найден')
+        import_format = options['format'] or (
+            'csv' if path.endswith('.csv') else 'ndjson')
+        checkpoint = Checkpoint(path)
+        importer = PostImporter(
+            media_dir=options['media_dir'],
+            batch_size=options['batch_size'],
+        )
+        started = time.monotonic()
+        with open(path, newline='', encoding='utf-8') as source:
+            importer.run(READERS[import_format](source), checkpoint)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано постов: {importer.imported}, '
+            f'пропущено записей: {importer.skipped} '
+            f'за {elapsed:.1f} с'
+        ))
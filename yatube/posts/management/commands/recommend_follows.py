@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Пересчет рекомендаций «на кого подписаться».'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        users = build_recommendations(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Рекомендации обновлены для {users} пользователей '
+            f'за {time.monotonic() - started:.1f} с'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts import group_stats
+
+
+class Command(BaseCommand):
+    help = 'Полный пересчет агрегатов каталога сообществ.'
+
+    def handle(self, *args, **options):
+        group_stats.refresh()
+        self.stdout.write(self.style.SUCCESS('Агрегаты сообществ обновлены'))
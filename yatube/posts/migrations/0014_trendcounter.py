@@ -0,0 +1,33 @@
+# Generated by Django 2.2.28 on 2026-10-19 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Комментарии поста'), ('author', 'Новые подписчики автора')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('author_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('group_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('bucket', models.PositiveIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='trendcounter',
+            index=models.Index(fields=['bucket'], name='trend_bucket_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='trendcounter',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'bucket'), name='unique trend bucket'),
+        ),
+    ]
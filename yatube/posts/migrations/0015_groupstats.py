@@ -0,0 +1,37 @@
+# Generated by Django 2.2.28 on 2026-10-19 18:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Max
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    totals = Group.objects.annotate(
+        posts_count=Count('posts'), last_post_at=Max('posts__pub_date'))
+    GroupStats.objects.bulk_create(
+        GroupStats(group_id=group.pk, posts_count=group.posts_count,
+                   last_post_at=group.last_post_at)
+        for group in totals
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_trendcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group')),
+                ('posts_count', models.PositiveIntegerField(db_index=True, default=0)),
+                ('last_post_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('top_authors', models.TextField(default='[]')),
+            ],
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
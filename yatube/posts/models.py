@@ -1,3 +1,5 @@
+import json
+
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -16,10 +18,30 @@ class Group(models.Model):
         return self.title
 
 
+class GroupStats(models.Model):
+    """Модель агрегатов для каталога сообществ"""
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    posts_count = models.PositiveIntegerField(default=0, db_index=True)
+    last_post_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    top_authors = models.TextField(default='[]')
+
+    def __str__(self):
+        return f'Статистика {self.group}'
+
+    @property
+    def top_author_names(self):
+        return json.loads(self.top_authors)
+
+
 class Post(models.Model):
     """Модель постов"""
     text = models.TextField()
-    pub_date = models.DateTimeField(auto_now_add=True)
+    pub_date = models.DateTimeField(auto_now_add=True, db_index=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -35,6 +57,9 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True,
     )
+    # Пишется пачками из posts.view_counts
+    views = models.PositiveIntegerField(
+        'Просмотры', default=0, editable=False)
 
     class Meta:
         ordering = ['-pub_date']
@@ -59,7 +84,7 @@ class Comment(models.Model):
         verbose_name='Комментарий',
         help_text='Текст нового комментария',
     )
-    pub_date = models.DateTimeField(auto_now_add=True)
+    pub_date = models.DateTimeField(auto_now_add=True, db_index=True)
 
 
 class Follow(models.Model):
@@ -82,3 +107,61 @@ class Follow(models.Model):
                 fields=['user', 'author'],
                 name='unique connection',)
         ]
+
+
+class Recommendation(models.Model):
+    """Модель рекомендаций авторов, посчитанных офлайн"""
+    user = models.ForeignKey(
+        User,
+        related_name='recommendations',
+        on_delete=models.CASCADE,
+    )
+    author = models.ForeignKey(
+        User,
+        related_name='recommended_to',
+        on_delete=models.CASCADE,
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['rank']
+        indexes = [
+            models.Index(fields=['user', 'rank'], name='recommendation_idx'),
+        ]
+
+
+class TrendCounter(models.Model):
+    """Модель счетчиков событий по часовым корзинам для трендов"""
+    POST = 'post'
+    AUTHOR = 'author'
+    KIND_CHOICES = (
+        (POST, 'Комментарии поста'),
+        (AUTHOR, 'Новые подписчики автора'),
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    author_id = models.PositiveIntegerField(null=True, blank=True)
+    group_id = models.PositiveIntegerField(null=True, blank=True)
+    bucket = models.PositiveIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id', 'bucket'],
+                name='unique trend bucket',)
+        ]
+        indexes = [
+            models.Index(fields=['bucket'], name='trend_bucket_idx'),
+        ]
+
+
+class ImportCheckpoint(models.Model):
+    """Модель контрольных точек импорта постов из файлов"""
+    source = models.CharField(max_length=500, unique=True)
+    done = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.source}: {self.done}'
@@ -0,0 +1,157 @@
+"""Массовые операции модерации.
+
+Все операции выполняются пачками по MODERATION_CHUNK_SIZE через
+update()/DELETE по списку id, без создания объектов моделей и без
+сигналов post_delete: кэш инвалидируется один раз в конце операции.
+Операции больше MODERATION_ASYNC_THRESHOLD строк уходят в очередь задач,
+их ход после каждой пачки виден в админке в списке задач.
+"""
+import base64
+import logging
+import pickle
+
+from django.db import connection, transaction
+
+from core import versions
+from core.tasks import enqueue, report_progress
+from . import feed, group_stats
+from .models import Comment, Post
+from .signals import COMMENTS_VERSION, POSTS_VERSION
+
+logger = logging.getLogger(__name__)
+
+MODERATION_CHUNK_SIZE = 500
+MODERATION_ASYNC_THRESHOLD = 5000
+
+
+def dump_query(queryset):
+    """Запрос выборки для операции вместо списка id.
+
+    Django сохраняет query через pickle и восстанавливает по нему
+    QuerySet; строка пишется только в таблицу задач, как и payload.
+    """
+    return base64.b64encode(
+        pickle.dumps(queryset.order_by().query)).decode('ascii')
+
+
+def _selection(model, query):
+    queryset = model.objects.all()
+    if query is not None:
+        queryset.query = pickle.loads(base64.b64decode(query))
+    return queryset
+
+
+def _progress(text):
+    logger.info('Модерация: %s', text)
+    report_progress(text)
+
+
+def _chunks(queryset):
+    """Отдает id пачками, пока запрос что-то находит.
+
+    Каждая пачка сразу удаляется или меняется, поэтому следующий
+    запрос начинает с оставшихся строк.
+    """
+    while True:
+        ids = list(queryset.order_by().values_list(
+            'pk', flat=True)[:MODERATION_CHUNK_SIZE])
+        if not ids:
+            return
+        yield ids
+
+
+def _raw_delete(model, column, ids):
+    with connection.cursor() as cursor:
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(
+            f'DELETE FROM {model._meta.db_table} '
+            f'WHERE {column} IN ({placeholders})',
+            ids,
+        )
+
+
+def _delete_posts(ids):
+    _raw_delete(Comment, 'post_id', ids)
+    _raw_delete(Post, 'id', ids)
+
+
+def delete_posts(post_ids=None, author_ids=None, query=None):
+    """Удаляет посты по id, запросу или всех постов авторов."""
+    posts = _selection(Post, query)
+    if post_ids is not None:
+        posts = posts.filter(pk__in=post_ids)
+    if author_ids is not None:
+        posts = posts.filter(author_id__in=author_ids)
+    touched_authors = set()
+    touched_groups = set()
+    total = 0
+    for ids in _chunks(posts):
+        chunk = Post.objects.filter(pk__in=ids)
+        touched_authors.update(chunk.values_list('author_id', flat=True))
+        touched_groups.update(chunk.exclude(group=None).values_list(
+            'group_id', flat=True))
+        with transaction.atomic():
+            _delete_posts(ids)
+        total += len(ids)
+        _progress(f'удалено постов {total}')
+    feed.invalidate_authors(touched_authors)
+    group_stats.refresh(touched_groups)
+    versions.bump(POSTS_VERSION, COMMENTS_VERSION)
+    return total
+
+
+def move_posts(to_group_id, post_ids=None, from_group_ids=None,
+               query=None):
+    """Переносит выбранные посты или все посты групп в другую группу."""
+    posts = _selection(Post, query).exclude(group_id=to_group_id)
+    if post_ids is not None:
+        posts = posts.filter(pk__in=post_ids)
+    if from_group_ids is not None:
+        posts = posts.filter(group_id__in=from_group_ids)
+    touched_groups = {to_group_id}
+    total = 0
+    for ids in _chunks(posts):
+        chunk = Post.objects.filter(pk__in=ids)
+        touched_groups.update(chunk.exclude(group=None).values_list(
+            'group_id', flat=True))
+        chunk.update(group_id=to_group_id)
+        total += len(ids)
+        _progress(f'перенесено постов {total}')
+    group_stats.refresh(touched_groups)
+    versions.bump(POSTS_VERSION)
+    return total
+
+
+def delete_comments(comment_ids=None, author_ids=None, query=None):
+    """Удаляет комментарии по id, запросу или все комментарии авторов."""
+    comments = _selection(Comment, query)
+    if comment_ids is not None:
+        comments = comments.filter(pk__in=comment_ids)
+    if author_ids is not None:
+        comments = comments.filter(author_id__in=author_ids)
+    total = 0
+    for ids in _chunks(comments):
+        _raw_delete(Comment, 'id', ids)
+        total += len(ids)
+        _progress(f'удалено комментариев {total}')
+    versions.bump(COMMENTS_VERSION)
+    return total
+
+
+OPERATIONS = {
+    'delete_posts': delete_posts,
+    'move_posts': move_posts,
+    'delete_comments': delete_comments,
+}
+
+
+def run(operation, count, **kwargs):
+    """Выполняет операцию сразу или ставит ее в очередь.
+
+    Возвращает число обработанных строк или None, если операция
+    отложена.
+    """
+    if count > MODERATION_ASYNC_THRESHOLD:
+        enqueue('posts.moderation', operation=operation, kwargs=kwargs)
+        return None
+    return OPERATIONS[operation](**kwargs)
@@ -0,0 +1,84 @@
+"""Посты ленты, вышедшие после последнего увиденного.
+
+Клиент присылает курсор самого нового поста своей страницы в формате
+ленты подписок: (pub_date в микросекундах, id). Курсор самого нового
+поста каждой ленты хранится в кэше под версией постов, поэтому пока
+новых постов нет, ответ не читает Post вовсе. Найденные новые посты
+кэшируются по курсору клиента до следующего изменения версии, и все
+клиенты с одной и той же страницей получают один ответ из кэша.
+"""
+from django.core.cache import cache
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.text import Truncator
+
+from core import versions
+from . import feed
+
+NEW_POSTS_LIMIT = 10
+NEW_POSTS_TIMEOUT = 60 * 10
+NEW_POSTS_TEXT_LENGTH = 100
+
+
+def _newer_filter(cursor):
+    """Условие «пост строго новее курсора» для SQL-запроса."""
+    timestamp, post_id = cursor
+    pub_date = feed.EPOCH + timestamp * feed.MICROSECOND
+    return Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=post_id)
+
+
+def _cached(key, stamps, compute):
+    key = versions.versioned_key(key, *stamps)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, NEW_POSTS_TIMEOUT)
+    return value
+
+
+def newest_cursor(feed_key, posts, stamps):
+    """Курсор самого нового поста ленты или None для пустой ленты."""
+    def compute():
+        newest = posts.order_by('-pub_date', '-id').values_list(
+            'pub_date', 'id').first()
+        # Пустой кортеж вместо None: None кэш считает промахом
+        return (feed._timestamp(newest[0]), newest[1]) if newest else ()
+    return _cached(f'newest:{feed_key}', stamps, compute) or None
+
+
+def _compact(post):
+    return {
+        'id': post.id,
+        'author': post.author.username,
+        'text': Truncator(post.text).chars(NEW_POSTS_TEXT_LENGTH),
+        'url': reverse('posts:post_detail', args=(post.id,)),
+        'pub_date': post.pub_date.isoformat(),
+    }
+
+
+def new_posts(feed_key, posts, stamps, cursor):
+    """Число постов ленты новее cursor и до NEW_POSTS_LIMIT из них.
+
+    feed_key различает ленты в кэше, stamps — версии, от которых лента
+    зависит. Курсор ответа — самый новый пост ленты.
+    """
+    newest = newest_cursor(feed_key, posts, stamps)
+    if newest is None or (cursor is not None and newest <= cursor):
+        return {
+            'count': 0,
+            'cursor': feed.encode_cursor(newest) if newest else None,
+            'posts': [],
+        }
+
+    def compute():
+        newer = posts if cursor is None else posts.filter(
+            _newer_filter(cursor))
+        latest = newer.select_related('author').order_by(
+            '-pub_date', '-id')[:NEW_POSTS_LIMIT]
+        return {
+            'count': newer.count(),
+            'cursor': feed.encode_cursor(newest),
+            'posts': [_compact(post) for post in latest],
+        }
+    since = feed.encode_cursor(cursor) if cursor else 'all'
+    return _cached(f'new_posts:{feed_key}:{since}', stamps, compute)
@@ -1,10 +1,45 @@
 from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
 
 
 POSTS_ON_PAGE = 10
+# Фильтрованные списки админки считаются не дальше этого предела
+ADMIN_COUNT_LIMIT = 10000
 
 
 def my_paginator(posts, request):
     paginator = Paginator(posts, POSTS_ON_PAGE)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор админки без полного COUNT(*) по большой таблице.
+
+    Для списка без фильтров число строк берется из статистики
+    PostgreSQL или по максимальному первичному ключу, для
+    отфильтрованного считается не дальше ADMIN_COUNT_LIMIT.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if queryset.query.where:
+            return queryset[:ADMIN_COUNT_LIMIT].count()
+        return self.estimate(queryset)
+
+    @staticmethod
+    def estimate(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > 0:
+                return int(row[0])
+        return queryset.aggregate(last=Max('pk'))['last'] or 0
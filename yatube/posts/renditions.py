@@ -0,0 +1,69 @@
+"""Адаптивные варианты картинок постов.
+
+Для каждой картинки нарезается несколько ширин в современных форматах
+и в JPEG для старых браузеров. Готовый набор адресов кэшируется по
+имени файла, так что шаблон не обращается к хранилищу миниатюр.
+"""
+from django.core.cache import cache
+from PIL import features
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.base import EXTENSIONS
+
+RENDITION_WIDTH = 960
+RENDITION_HEIGHT = 339
+RENDITION_WIDTHS = (480, 960, 1440)
+RENDITION_SIZES = '(min-width: 960px) 960px, 100vw'
+RENDITIONS_TIMEOUT = 60 * 60 * 24 * 30
+FALLBACK_FORMAT = 'JPEG'
+# От лучшего сжатия к худшему: браузер берет первый понятный ему
+MODERN_FORMATS = (
+    ('AVIF', 'image/avif', 'avif'),
+    ('WEBP', 'image/webp', 'webp'),
+)
+
+
+def modern_formats():
+    """Форматы, которые умеют и Pillow, и sorl-thumbnail."""
+    return [(image_format, mime) for image_format, mime, feature
+            in MODERN_FORMATS
+            if image_format in EXTENSIONS and features.check(feature)]
+
+
+def _key(image):
+    return f'renditions:{image.name}'
+
+
+def _urls(image, image_format):
+    urls = {}
+    for width in RENDITION_WIDTHS:
+        height = round(width * RENDITION_HEIGHT / RENDITION_WIDTH)
+        urls[width] = get_thumbnail(
+            image, f'{width}x{height}', crop='center', upscale=True,
+            format=image_format).url
+    return urls
+
+
+def _srcset(urls):
+    return ', '.join(f'{url} {width}w' for width, url in urls.items())
+
+
+def generate(image):
+    """Нарезает все варианты картинки и кэширует их адреса."""
+    fallback = _urls(image, FALLBACK_FORMAT)
+    renditions = {
+        'sources': [
+            {'type': mime, 'srcset': _srcset(_urls(image, image_format))}
+            for image_format, mime in modern_formats()
+        ],
+        'srcset': _srcset(fallback),
+        'src': fallback[RENDITION_WIDTH],
+    }
+    cache.set(_key(image), renditions, RENDITIONS_TIMEOUT)
+    return renditions
+
+
+def get_renditions(image):
+    renditions = cache.get(_key(image))
+    if renditions is None:
+        renditions = generate(image)
+    return renditions
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core import versions
+from . import feed, group_choices, group_stats
+from .models import Comment, Group, Post
+
+# Версии для кэша страниц, см. PAGE_CACHE_VIEWS
+POSTS_VERSION = 'posts'
+COMMENTS_VERSION = 'comments'
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender, instance, update_fields=None, **kwargs):
+    # Группа до сохранения: перенос из любого места (форма, админка,
+    # save() в коде) должен попасть в счетчики сообществ
+    if instance._state.adding or (
+            update_fields is not None and 'group' not in update_fields):
+        instance._stored_group_id = instance.group_id
+        return
+    instance._stored_group_id = Post.objects.filter(
+        pk=instance.pk).values_list('group_id', flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    if created:
+        feed.push_post(instance)
+        group_stats.post_added(instance.group_id, instance.pub_date)
+    else:
+        group_stats.post_moved(
+            instance._stored_group_id, instance.group_id,
+            instance.pub_date)
+    versions.bump(POSTS_VERSION)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    feed.invalidate_authors([instance.author_id])
+    group_stats.post_removed(instance.group_id)
+    versions.bump(POSTS_VERSION)
+
+
+# Удаление из админки, ORM и каскадом от поста или пользователя.
+# Массовые операции moderation удаляют комментарии SQL-запросом мимо
+# сигнала и сбрасывают версию сами, один раз на операцию
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, **kwargs):
+    versions.bump(COMMENTS_VERSION)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, **kwargs):
+    group_choices.groups_changed()
@@ -0,0 +1,38 @@
+// Подгрузка групп поиском для виджета GroupAutocomplete
+document.querySelectorAll('select[data-autocomplete-url]').forEach(function (select) {
+    var search = document.createElement('input');
+    search.type = 'search';
+    search.className = 'form-control mb-2';
+    search.placeholder = 'Поиск группы';
+    select.parentNode.insertBefore(search, select);
+    var timer = null;
+
+    function load() {
+        var url = select.dataset.autocompleteUrl + '?q=' + encodeURIComponent(search.value);
+        fetch(url).then(function (response) {
+            return response.json();
+        }).then(function (data) {
+            var current = select.value;
+            Array.from(select.options).forEach(function (option) {
+                if (option.value && option.value !== current) {
+                    option.remove();
+                }
+            });
+            data.results.forEach(function (group) {
+                if (String(group.id) !== current) {
+                    select.add(new Option(group.text, group.id));
+                }
+            });
+        });
+    }
+
+    search.addEventListener('input', function () {
+        clearTimeout(timer);
+        timer = setTimeout(load, 250);
+    });
+    select.addEventListener('focus', function () {
+        if (select.options.length <= 2) {
+            load();
+        }
+    }, {once: true});
+});
@@ -0,0 +1,31 @@
+// Новые комментарии поста приходят потоком SSE и добавляются в конец списка
+(function () {
+    var list = document.getElementById('comments');
+    if (!list || !window.EventSource) {
+        return;
+    }
+    var comments = list.querySelectorAll('[data-comment-id]');
+    var lastId = comments.length ? comments[comments.length - 1].dataset.commentId : 0;
+    var source = new EventSource(list.dataset.streamUrl + '?after=' + lastId);
+    source.addEventListener('comment', function (event) {
+        var data = JSON.parse(event.data);
+        if (!list.querySelector('[data-comment-id="' + data.id + '"]')) {
+            list.insertAdjacentHTML('beforeend', data.html);
+        }
+    });
+
+    // Свой комментарий отправляется без перезагрузки, в список его добавит поток
+    document.querySelectorAll('form[action$="/comment/"]').forEach(function (form) {
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            fetch(form.action, {
+                method: 'POST',
+                body: new FormData(form),
+                credentials: 'same-origin',
+                redirect: 'manual'
+            }).then(function () {
+                form.reset();
+            });
+        });
+    });
+})();
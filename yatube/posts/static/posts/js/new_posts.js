@@ -0,0 +1,30 @@
+// Раз в полминуты спрашивает, вышли ли посты новее первого на странице
+(function () {
+    var POLL_INTERVAL = 30000;
+    var poller = document.querySelector('[data-new-posts-url]');
+    if (!poller) {
+        return;
+    }
+    var link = document.createElement('a');
+    link.className = 'btn btn-sm btn-primary';
+    link.href = window.location.pathname;
+    link.hidden = true;
+    poller.appendChild(link);
+
+    function poll() {
+        if (document.hidden) {
+            return;
+        }
+        var url = poller.dataset.newPostsUrl + '?since=' + poller.dataset.cursor;
+        fetch(url, {credentials: 'same-origin'}).then(function (response) {
+            return response.json();
+        }).then(function (data) {
+            if (data.count) {
+                link.textContent = 'Новых постов: ' + data.count + '. Показать';
+                link.hidden = false;
+            }
+        });
+    }
+
+    setInterval(poll, POLL_INTERVAL);
+})();
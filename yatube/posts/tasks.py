@@ -0,0 +1,49 @@
+from core.tasks import enqueue, task
+from . import feed, moderation, renditions, trending
+from .models import Post
+
+
+@task('posts.warm_thumbnails', batch=True)
+def warm_thumbnails(payloads):
+    """Заранее нарезает варианты картинок, чтобы лента не делала этого."""
+    post_ids = {payload['post_id'] for payload in payloads}
+    posts = Post.objects.filter(pk__in=post_ids).exclude(
+        image='').only('image')
+    for post in posts:
+        renditions.generate(post.image)
+
+
+@task('posts.warm_author_streams', batch=True)
+def warm_author_streams(payloads):
+    """Загружает в кэш потоки последних постов холодных авторов ленты."""
+    author_ids = set()
+    for payload in payloads:
+        author_ids.update(payload['author_ids'])
+    for author_id in author_ids:
+        feed.load_author_stream(author_id)
+
+
+@task('posts.trend_events', batch=True)
+def trend_events(payloads):
+    """Применяет накопленные события к счетчикам.
+
+    Топы пересчитывает отдельная задача: ее сбой не должен повторять
+    уже примененные события.
+    """
+    trending.apply_events(payloads)
+    enqueue('posts.trend_refresh')
+
+
+@task('posts.trend_refresh', batch=True)
+def trend_refresh(payloads):
+    """Пересчитывает топы; несколько задач из выборки сливаются в одну."""
+    trending.refresh()
+
+
+@task('posts.moderation')
+def run_moderation(operation, kwargs):
+    """Выполняет отложенную массовую операцию модерации.
+
+    Операции идемпотентны: повтор после сбоя продолжает с оставшихся строк.
+    """
+    moderation.OPERATIONS[operation](**kwargs)
@@ -0,0 +1,11 @@
+from django import template
+
+from ..follow_graph import followees_for
+
+register = template.Library()
+
+
+@register.filter
+def follows(user, author):
+    """Подписан ли user на author; author — пользователь или его id."""
+    return getattr(author, 'id', author) in followees_for(user)
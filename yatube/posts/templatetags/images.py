@@ -0,0 +1,52 @@
+import logging
+
+from django import template
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from sorl.thumbnail.conf import settings as thumbnail_settings
+
+from ..renditions import (RENDITION_HEIGHT, RENDITION_SIZES, RENDITION_WIDTH,
+                          get_renditions)
+
+logger = logging.getLogger(__name__)
+register = template.Library()
+
+# Разметка собирается без шаблона: тег вызывается для каждого поста ленты
+PICTURE_HTML = (
+    '<picture>{sources}<img class="card-img my-2" src="{src}" '
+    'srcset="{srcset}" sizes="{sizes}" width="{width}" height="{height}" '
+    'style="height: auto;" decoding="async" {loading} alt=""></picture>'
+)
+
+
+@register.simple_tag
+def responsive_image(image, eager=False):
+    """<picture> с вариантами картинки; по умолчанию грузится лениво.
+
+    Как и тег thumbnail, при ошибке нарезки картинка просто не выводится.
+    """
+    if not image:
+        return ''
+    try:
+        renditions = get_renditions(image)
+    except Exception:
+        if thumbnail_settings.THUMBNAIL_DEBUG:
+            raise
+        logger.exception('Не удалось нарезать картинку %s', image.name)
+        return ''
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((source['type'], source['srcset'], RENDITION_SIZES)
+         for source in renditions['sources']),
+    )
+    return format_html(
+        PICTURE_HTML,
+        sources=sources,
+        src=renditions['src'],
+        srcset=renditions['srcset'],
+        sizes=RENDITION_SIZES,
+        width=RENDITION_WIDTH,
+        height=RENDITION_HEIGHT,
+        loading=mark_safe(
+            'fetchpriority="high"' if eager else 'loading="lazy"'),
+    )
@@ -0,0 +1,24 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from .. import feed
+
+register = template.Library()
+
+POLLER_HTML = (
+    '<div data-new-posts-url="{}" data-cursor="{}"></div>'
+    '<script src="{}" defer></script>'
+)
+
+
+@register.simple_tag(takes_context=True)
+def new_posts_poller(context, url, page_obj):
+    """Опрос новых постов ленты; выводится только на первой странице."""
+    query = context['request'].GET
+    if query.get('page', '1') != '1' or 'cursor' in query:
+        return ''
+    first = next(iter(page_obj), None)
+    cursor = feed.encode_cursor(feed.post_key(first)) if first else ''
+    return format_html(
+        POLLER_HTML, url, cursor, static('posts/js/new_posts.js'))
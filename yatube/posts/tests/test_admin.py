@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.contrib.admin import ACTION_CHECKBOX_NAME
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import moderation
+from ..models import Comment, Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class ModerationActionsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        cls.spammer = User.objects.create(username='spammer')
+        cls.user = User.objects.create(username='test_username')
+        cls.group_a = Group.objects.create(
+            title='Group A', slug='group_a', description='Test')
+        cls.group_b = Group.objects.create(
+            title='Group B', slug='group_b', description='Test')
+        cls.spam = [Post.objects.create(
+            text='spam', author=cls.spammer, group=cls.group_a)
+            for _ in range(3)]
+        cls.post = Post.objects.create(
+            text='post', author=cls.user, group=cls.group_a)
+        Comment.objects.create(post=cls.post, author=cls.spammer, text='spam')
+        Comment.objects.create(post=cls.spam[0], author=cls.user, text='ok')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def act(self, model, action, ids, **data):
+        return self.client.post(
+            reverse(f'admin:posts_{model}_changelist'),
+            {'action': action, ACTION_CHECKBOX_NAME: ids, **data})
+
+    def test_delete_author_posts(self):
+        """Удаляются все посты автора вместе с комментариями к ним."""
+        self.act('post', 'delete_author_posts', [self.spam[0].pk])
+        self.assertFalse(Post.objects.filter(author=self.spammer).exists())
+        self.assertEqual(Comment.objects.count(), 1)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group_a).posts_count, 1)
+
+    def test_move_group_posts(self):
+        """Все посты группы переносятся в выбранную группу."""
+        self.act('post', 'move_group_posts', [self.post.pk],
+                 group=self.group_b.pk)
+        self.assertEqual(Post.objects.filter(group=self.group_b).count(), 4)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group_a).posts_count, 0)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group_b).posts_count, 4)
+
+    def test_delete_author_comments(self):
+        self.act('comment', 'delete_author_comments',
+                 [Comment.objects.get(author=self.spammer).pk])
+        self.assertFalse(Comment.objects.filter(author=self.spammer).exists())
+        self.assertTrue(Comment.objects.filter(author=self.user).exists())
+
+    def test_select_across_passes_query(self):
+        """«Выбрать все» передает в задачу запрос списка, а не id."""
+        with mock.patch.object(moderation, 'MODERATION_ASYNC_THRESHOLD', 2), \
+                mock.patch.object(moderation, 'enqueue') as enqueue:
+            self.client.post(
+                reverse('admin:posts_post_changelist') + '?q=spam',
+                {'action': 'delete_posts', 'select_across': '1',
+                 ACTION_CHECKBOX_NAME: [self.spam[0].pk]})
+        kwargs = enqueue.call_args[1]['kwargs']
+        self.assertEqual(set(kwargs), {'query'})
+        self.assertEqual(moderation.delete_posts(**kwargs), 3)
+        self.assertEqual(list(Post.objects.all()), [self.post])
+
+    def test_large_operation_is_queued(self):
+        """Операции больше порога откладываются в очередь задач."""
+        with mock.patch.object(moderation, 'MODERATION_ASYNC_THRESHOLD', 2), \
+                mock.patch.object(moderation, 'enqueue') as enqueue:
+            self.act('post', 'delete_posts', [post.pk for post in self.spam])
+        self.assertEqual(Post.objects.count(), 4)
+        enqueue.assert_called_once()
+        self.assertEqual(enqueue.call_args[0], ('posts.moderation',))
+        response = self.client.get(reverse('admin:posts_post_changelist'))
+        self.assertContains(
+            response, reverse('admin:core_task_changelist')
+            + '?name=posts.moderation')
+
+
+class AdminChangelistTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        group = Group.objects.create(
+            title='Group', slug='group', description='Test')
+        for number in range(5):
+            author = User.objects.create(username=f'author_{number}')
+            post = Post.objects.create(
+                text='post', author=author, group=group)
+            Comment.objects.create(post=post, author=author, text='text')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def test_changelist_queries_do_not_grow(self):
+        """Список постов и комментариев не делает запросов на строку."""
+        # Оценка числа, строки и две для дат; сессия и пользователь в кэше
+        for model in ('post', 'comment'):
+            url = reverse(f'admin:posts_{model}_changelist')
+            self.client.get(url)
+            with self.assertNumQueries(4):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_estimated_count(self):
+        response = self.client.get(reverse('admin:posts_post_changelist'))
+        self.assertEqual(response.context['cl'].result_count, 5)
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'nothing'})
+        self.assertEqual(response.context['cl'].result_count, 0)
@@ -0,0 +1,66 @@
+import io
+import json
+import zipfile
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class PostExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='test_username')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='Test description',
+        )
+        cls.post = Post.objects.create(
+            text='Test text',
+            author=cls.author,
+            group=cls.group,
+        )
+        Comment.objects.create(
+            post=cls.post, author=cls.author, text='Test comment')
+
+    def setUp(self) -> None:
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_export_ndjson(self):
+        """Выгрузка в NDJSON содержит посты и комментарии автора."""
+        response = self.authorized_client.get(
+            reverse('posts:profile_export',
+                    kwargs={'username': 'test_username'}))
+        self.assertTrue(response.streaming)
+        records = [json.loads(line) for line in
+                   b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([record['type'] for record in records],
+                         ['post', 'comment'])
+        self.assertEqual(records[0]['group'], 'test_slug')
+        self.assertEqual(records[1]['post'], self.post.id)
+
+    def test_export_zip(self):
+        """Zip-архив собирается из потока и содержит NDJSON."""
+        response = self.authorized_client.get(
+            reverse('posts:profile_export',
+                    kwargs={'username': 'test_username'}),
+            {'format': 'zip'})
+        archive = zipfile.ZipFile(
+            io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIn(b'Test comment', archive.read('export.ndjson'))
+
+    def test_export_forbidden_for_other_users(self):
+        """Чужую выгрузку получить нельзя."""
+        other_client = Client()
+        other_client.force_login(User.objects.create(username='other'))
+        response = other_client.get(
+            reverse('posts:profile_export',
+                    kwargs={'username': 'test_username'}))
+        self.assertRedirects(response, reverse(
+            'posts:profile', kwargs={'username': 'test_username'}))
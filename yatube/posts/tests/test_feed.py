@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from .. import feed
+from ..models import Post
+
+User = get_user_model()
+PAGE_SIZE = 4
+
+
+class FeedMergeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [User.objects.create(username=f'author_{number}')
+                       for number in range(3)]
+        for number in range(15):
+            Post.objects.create(
+                text=f'post {number}',
+                author=cls.authors[number % len(cls.authors)],
+            )
+        cls.expected = list(Post.objects.order_by(
+            '-pub_date', '-id').values_list('id', flat=True))
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def read_feed(self, page_size=PAGE_SIZE):
+        author_ids = [author.id for author in self.authors]
+        post_ids = []
+        cursor = None
+        while True:
+            page = feed.get_feed_page(author_ids, cursor, page_size)
+            post_ids += [post.id for post in page]
+            if not page.has_next():
+                return post_ids
+            cursor = feed.decode_cursor(page.next_cursor)
+
+    def test_cold_authors_fall_back_to_sql(self):
+        """Без кэша лента целиком собирается из базы."""
+        self.assertEqual(self.read_feed(), self.expected)
+
+    def test_warm_streams_merged(self):
+        """Закэшированные потоки сливаются в правильном порядке."""
+        for author in self.authors:
+            feed.load_author_stream(author.id)
+        self.assertEqual(self.read_feed(), self.expected)
+
+    def test_truncated_streams_are_completed_from_sql(self):
+        """Обрезанные потоки дочитываются из базы на глубоких страницах."""
+        with mock.patch.object(feed, 'AUTHOR_STREAM_SIZE', 3):
+            for author in self.authors:
+                feed.load_author_stream(author.id)
+            self.assertEqual(self.read_feed(page_size=2), self.expected)
+
+    def test_new_post_pushed_to_stream(self):
+        """Новый пост попадает в начало закэшированного потока."""
+        author = self.authors[0]
+        feed.load_author_stream(author.id)
+        post = Post.objects.create(text='new', author=author)
+        page = feed.get_feed_page([author.id], page_size=1)
+        self.assertEqual(page[0], post)
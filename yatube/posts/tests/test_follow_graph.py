@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import follow_graph
+from ..models import Comment, Follow, Post
+
+User = get_user_model()
+
+
+class FollowGraphTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='test_username')
+        cls.author = User.objects.create(username='test_author')
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_follow_updates_cached_graph(self):
+        """Подписка и отписка сразу отражаются в кэше."""
+        follow_graph.get_followees(self.user.id)
+        follow_graph.get_followers_count(self.author.id)
+        self.authorized_client.get(reverse(
+            'posts:profile_follow', kwargs={'username': 'test_author'}))
+        with self.assertNumQueries(0):
+            self.assertIn(self.author.id,
+                          follow_graph.get_followees(self.user.id))
+            self.assertEqual(
+                follow_graph.get_followers_count(self.author.id), 1)
+        self.authorized_client.get(reverse(
+            'posts:profile_unfollow', kwargs={'username': 'test_author'}))
+        with self.assertNumQueries(0):
+            self.assertEqual(follow_graph.get_followees(self.user.id),
+                             frozenset())
+            self.assertEqual(
+                follow_graph.get_followers_count(self.author.id), 0)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_profile_uses_cached_follow_state(self):
+        """Страница профиля не обращается к Follow при прогретом кэше."""
+        follow_graph.follow(self.user.id, self.author.id)
+        response = self.authorized_client.get(reverse(
+            'posts:profile', kwargs={'username': 'test_author'}))
+        self.assertContains(response, 'Отписаться')
+        self.assertEqual(response.context['followers_count'], 1)
+
+    def test_following_map_single_lookup(self):
+        """Состояние подписки на несколько авторов — одно чтение кэша."""
+        other = User.objects.create(username='test_other')
+        follow_graph.follow(self.user.id, self.author.id)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                follow_graph.following_map(user, [self.author.id, other.id]),
+                {self.author.id: True, other.id: False})
+            self.assertTrue(follow_graph.is_following(user, self.author.id))
+
+    def test_follow_filter_on_post_detail(self):
+        """Кнопки подписки у авторов комментариев."""
+        post = Post.objects.create(text='Test text', author=self.user)
+        Comment.objects.create(post=post, author=self.author, text='first')
+        follow_graph.follow(self.user.id, self.author.id)
+        response = self.authorized_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.id}))
+        self.assertContains(response, reverse(
+            'posts:profile_unfollow', kwargs={'username': 'test_author'}))
@@ -1,53 +1,32 @@
-import shutil
-import tempfile
-from django.conf import settings
-from django.test import Client, TestCase, override_settings
+from django.test import Client, TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from http import HTTPStatus
-from django.core.files.uploadedfile import SimpleUploadedFile
 
+from core.testing import small_image
 from ..models import Post, Group, Comment
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 User = get_user_model()
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+# Картинки сохраняются во временный MEDIA_ROOT тестового профиля
 class PostCreateTest(TestCase):
-    def setUp(self) -> None:
-        self.authorized_user = User.objects.create(username='test_username')
-        self.authorized_client = Client()
-        self.authorized_client.force_login(self.authorized_user)
-
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
+        cls.authorized_user = User.objects.create(username='test_username')
         cls.group = Group.objects.create(
             title='Test group',
             slug='test_slug',
             description='Test description',
         )
 
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+    def setUp(self) -> None:
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.authorized_user)
 
     def test_post_create(self):
         """Проверка создания поста с картинкой."""
-        image = SimpleUploadedFile(
-            name='test_image.jpg',
-            content_type='image/jpeg',
-            content=b'\x47\x49\x46\x38\x39'
-                    b'\x61\x01\x00\x01\x00'
-                    b'\x00\x00\x00\x21\xf9\x04'
-                    b'\x01\x0a\x00\x01\x00'
-                    b'\x2c\x00\x00\x00\x00'
-                    b'\x01\x00\x01\x00\x00\x02'
-                    b'\x02\x4c\x01\x00\x3b'
-        )
+        image = small_image('test_image.jpg')
         form_data = {
             'text': 'some random text',
             'group': self.group.pk,
@@ -85,17 +64,7 @@ class PostCreateTest(TestCase):
         edited_post_data = {
             'text': 'some edited random text',
             'group': group2.pk,
-            'image': SimpleUploadedFile(
-                name='test_image.jpg',
-                content_type='image/jpeg',
-                content=b'\x47\x49\x46\x38\x39'
-                        b'\x61\x01\x00\x01\x00'
-                        b'\x00\x00\x00\x21\xf9\x04'
-                        b'\x01\x0a\x00\x01\x00'
-                        b'\x2c\x00\x00\x00\x00'
-                        b'\x01\x00\x01\x00\x00\x02'
-                        b'\x02\x4c\x01\x00\x3b'
-            ),
+            'image': small_image('test_image.jpg'),
         }
 
         self.authorized_client.post(
@@ -112,7 +81,7 @@ class PostCreateTest(TestCase):
     def test_comments(self):
         """Проверка создания комментария авторизованным пользователем
         и гостем."""
-        Post.objects.create(
+        post = Post.objects.create(
             text='test text',
             author=self.authorized_user,
             group=self.group,
@@ -120,21 +89,21 @@ class PostCreateTest(TestCase):
 
         # Пишем комментарий к первому посту
         self.authorized_client.post(
-            reverse('posts:add_comment', kwargs={'post_id': 1}),
+            reverse('posts:add_comment', kwargs={'post_id': post.id}),
             data={'text': 'test comment'},
             follow=True,
         )
-        comment = Comment.objects.get(post_id=1)
+        comment = Comment.objects.get(post=post)
         self.assertEqual(comment.text, 'test comment')
 
         # Пытаемся написать комментарий неавторизированным пользователем
         guest_comment = self.client.post(
-            reverse('posts:add_comment', kwargs={'post_id': 1}),
+            reverse('posts:add_comment', kwargs={'post_id': post.id}),
             data={'text': 'test comment by guest'},
             follow=True,
         )
-        self.assertRedirects(guest_comment,
-                             '/auth/login/?next=/posts/1/comment/')
+        self.assertRedirects(
+            guest_comment, f'/auth/login/?next=/posts/{post.id}/comment/')
         self.assertEqual(Comment.objects.count(), 1)
         self.assertEqual(
             comment._meta.get_field('text').verbose_name,
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class GroupChoicesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='test_username')
+        cls.cats = Group.objects.create(
+            title='Cats', slug='cats', description='Test')
+        cls.dogs = Group.objects.create(
+            title='Dogs', slug='dogs', description='Test')
+        cls.post = Post.objects.create(
+            text='text', author=cls.user, group=cls.dogs)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def page_parts(self, url):
+        """Страница формы до <noscript> и полный список в нем."""
+        content = self.client.get(url).content.decode()
+        return content.partition('<noscript>')[::2]
+
+    def test_form_renders_only_selected_group(self):
+        """Виджет выводит выбранную группу, весь список — в noscript."""
+        main, fallback = self.page_parts(reverse('posts:post_create'))
+        self.assertNotIn('Cats', main)
+        self.assertIn('Cats', fallback)
+        main, fallback = self.page_parts(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}))
+        self.assertIn('Dogs', main)
+        self.assertNotIn('Cats', main)
+        self.assertIn(f'<option value="{self.dogs.id}" selected>Dogs',
+                      fallback)
+
+    def test_group_chosen_without_javascript(self):
+        """Без скриптов группа приходит из полного списка."""
+        self.client.post(reverse('posts:post_create'), {
+            'text': 'no js', 'group': '', 'group_all': self.cats.id})
+        self.assertEqual(Post.objects.get(text='no js').group, self.cats)
+
+    def test_new_group_in_cached_form(self):
+        """Новая группа сразу появляется в закэшированной форме."""
+        url = reverse('posts:post_create')
+        self.client.get(url)
+        Group.objects.create(title='Camels', slug='camels', description='')
+        self.assertIn('Camels', self.page_parts(url)[1])
+
+    def test_autocomplete_sees_new_groups(self):
+        """Новая группа сбрасывает закэшированный список."""
+        url = reverse('posts:group_autocomplete')
+        response = self.client.get(url, {'q': 'ca'})
+        self.assertEqual(response.json()['results'],
+                         [{'id': self.cats.id, 'text': 'Cats'}])
+        Group.objects.create(title='Camels', slug='camels', description='')
+        response = self.client.get(url, {'q': 'ca'})
+        self.assertEqual(
+            [group['text'] for group in response.json()['results']],
+            ['Camels', 'Cats'])
+
+    def test_form_pages_queries(self):
+        """Сессия и пользователь в кэше, страница правки читает только пост."""
+        urls = (
+            (reverse('posts:post_create'), 0),
+            (reverse('posts:post_edit', kwargs={'post_id': self.post.id}), 1),
+        )
+        for url, queries in urls:
+            self.client.get(url)
+            with self.assertNumQueries(queries):
+                self.client.get(url)
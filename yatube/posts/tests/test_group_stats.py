@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import group_stats
+from ..models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupDirectoryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='test_username')
+        cls.quiet_group = Group.objects.create(
+            title='Quiet group', slug='quiet', description='Test')
+        cls.busy_group = Group.objects.create(
+            title='Busy group', slug='busy', description='Test')
+        Post.objects.create(text='old', author=cls.user, group=cls.quiet_group)
+        for _ in range(3):
+            Post.objects.create(
+                text='new', author=cls.user, group=cls.busy_group)
+
+    def test_stats_updated_incrementally(self):
+        """Счетчики меняются при создании, переносе и удалении постов."""
+        stats = GroupStats.objects.get(group=self.busy_group)
+        self.assertEqual(stats.posts_count, 3)
+        post = Post.objects.filter(group=self.busy_group).first()
+        client = Client()
+        client.force_login(self.user)
+        client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            data={'text': 'moved', 'group': self.quiet_group.id})
+        self.assertEqual(
+            GroupStats.objects.get(group=self.quiet_group).posts_count, 2)
+        Post.objects.get(pk=post.pk).delete()
+        self.assertEqual(
+            GroupStats.objects.get(group=self.quiet_group).posts_count, 1)
+
+    def test_group_change_outside_view_counted(self):
+        """Перенос поста через save() (админка, код) меняет счетчики."""
+        post = Post.objects.filter(group=self.busy_group).first()
+        post.group = self.quiet_group
+        post.save()
+        post.text = 'edited'
+        post.save()
+        self.assertEqual(
+            GroupStats.objects.get(group=self.busy_group).posts_count, 2)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.quiet_group).posts_count, 2)
+
+    def test_refresh_builds_top_authors(self):
+        """Полный пересчет заполняет топ авторов."""
+        group_stats.refresh()
+        stats = GroupStats.objects.get(group=self.busy_group)
+        self.assertEqual(stats.top_author_names, ['test_username'])
+
+    def test_directory_sorted_without_per_group_queries(self):
+        """Каталог сортируется по активности одним запросом к группам."""
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('posts:group_directory'), {'sort': 'activity'})
+        self.assertEqual(list(response.context['page_obj']),
+                         [self.busy_group, self.quiet_group])
+        response = self.client.get(
+            reverse('posts:group_directory'), {'q': 'quiet'})
+        self.assertEqual(list(response.context['page_obj']),
+                         [self.quiet_group])
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.testing import small_image
+
+from .. import importer
+from ..importer import Checkpoint, PostImporter, read_ndjson
+from ..models import Group, ImportCheckpoint, Post
+
+User = get_user_model()
+
+
+class PostImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create(username='test_username')
+        Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='Test description',
+        )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.temp_dir = tempfile.mkdtemp(prefix='yatube-test-import-')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def write_dump(self, records):
+        path = os.path.join(self.temp_dir, 'dump.ndjson')
+        with open(path, 'w') as dump:
+            for record in records:
+                dump.write(json.dumps(record) + '\n')
+        return path
+
+    def test_import_ndjson(self):
+        """Импорт сохраняет даты, авторов и группы."""
+        path = self.write_dump([
+            {'author': 'test_username', 'text': 'first',
+             'group': 'test_slug', 'pub_date': '2020-01-01T10:00:00+00:00'},
+            {'author': 'test_username', 'text': 'second'},
+            {'author': 'unknown', 'text': 'skipped'},
+        ])
+        call_command('import_posts', path, batch_size=2, stdout=open(
+            os.devnull, 'w'))
+        self.assertEqual(Post.objects.count(), 2)
+        post = Post.objects.get(text='first')
+        self.assertEqual(post.group.slug, 'test_slug')
+        self.assertEqual(post.pub_date.year, 2020)
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_image_copied_once(self):
+        """Повторный импорт картинки не создает ее копию."""
+        with open(os.path.join(self.temp_dir, 'import.gif'), 'wb') as image:
+            image.write(small_image().read())
+        importer = PostImporter(media_dir=self.temp_dir)
+        name = importer.store_image('import.gif')
+        self.assertEqual(importer.store_image('import.gif'), name)
+        self.assertTrue(default_storage.exists(name))
+        _, files = default_storage.listdir('posts')
+        self.assertEqual(
+            [file for file in files if file.endswith('import.gif')],
+            [os.path.basename(name)])
+
+    def test_import_resumes_from_checkpoint(self):
+        """Уже импортированные записи пропускаются."""
+        path = self.write_dump([
+            {'author': 'test_username', 'text': 'done before'},
+            {'author': 'test_username', 'text': 'new'},
+        ])
+        checkpoint = Checkpoint(path)
+        checkpoint.save(1)
+        with open(path) as source:
+            PostImporter().run(read_ndjson(source), checkpoint)
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['new'])
+
+    def test_failed_batch_not_duplicated_on_resume(self):
+        """Пачка и контрольная точка фиксируются вместе."""
+        path = self.write_dump([
+            {'author': 'test_username', 'text': f'post {number}'}
+            for number in range(4)
+        ])
+        checkpoint = Checkpoint(path)
+        real_posts_added = importer.posts_added
+        batches = []
+
+        def fail_second_batch(posts):
+            batches.append(posts)
+            if len(batches) == 2:
+                raise RuntimeError('crash')
+            real_posts_added(posts)
+
+        with mock.patch.object(importer, 'posts_added',
+                               side_effect=fail_second_batch), \
+                open(path) as source, self.assertRaises(RuntimeError):
+            PostImporter(batch_size=2).run(read_ndjson(source), checkpoint)
+        self.assertEqual(checkpoint.load(), 2)
+        self.assertEqual(Post.objects.count(), 2)
+        with open(path) as source:
+            PostImporter(batch_size=2).run(read_ndjson(source), checkpoint)
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            [f'post {number}' for number in range(4)])
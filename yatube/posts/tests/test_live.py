@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import live
+from ..models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(LIVE_COMMENTS_TIMEOUT=0)
+class CommentStreamTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='test_reader')
+        cls.post = Post.objects.create(text='post', author=cls.user)
+        cls.old = Comment.objects.create(
+            post=cls.post, author=cls.user, text='old comment')
+        cls.new = Comment.objects.create(
+            post=cls.post, author=cls.user, text='new comment')
+        cls.url = reverse('posts:comment_stream',
+                          kwargs={'post_id': cls.post.id})
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_stream_sends_comments_after_last_seen(self):
+        response = self.client.get(self.url, {'after': self.old.id})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = self.read(response)
+        self.assertIn(f'id: {self.new.id}\nevent: comment\n', content)
+        self.assertIn('new comment', content)
+        self.assertNotIn('old comment', content)
+
+    def test_last_event_id_wins_after_reconnect(self):
+        response = self.client.get(
+            self.url, {'after': 0}, HTTP_LAST_EVENT_ID=str(self.new.id))
+        self.assertNotIn('event: comment', self.read(response))
+
+    def test_stream_without_mark_starts_from_new_comments(self):
+        self.assertNotIn('event: comment', self.read(self.client.get(
+            self.url)))
+
+    @override_settings(LIVE_COMMENTS_MAX_STREAMS=1)
+    def test_streams_over_limit_fall_back_to_polling(self):
+        """Сверх лимита поток сразу закрывается и реже переподключается."""
+        first = self.client.get(self.url, {'after': 0})
+        self.assertEqual(live._open_streams, 1)
+        second = self.read(self.client.get(self.url, {'after': 0}))
+        self.assertIn(
+            f'retry: {live.FALLBACK_RECONNECT_MILLISECONDS}\n', second)
+        self.assertIn(f'id: {self.new.id}\n', second)
+        self.assertEqual(live._open_streams, 1)
+        self.assertIn(f'retry: {live.RECONNECT_MILLISECONDS}\n',
+                      self.read(first))
+        self.assertEqual(live._open_streams, 0)
+
+    def test_unread_stream_releases_slot_on_close(self):
+        response = self.client.get(self.url)
+        self.assertEqual(live._open_streams, 1)
+        response.close()
+        self.assertEqual(live._open_streams, 0)
+
+    def test_add_comment_publishes(self):
+        client = Client()
+        client.force_login(self.user)
+        with mock.patch.object(live.pubsub, 'publish') as publish:
+            client.post(
+                reverse('posts:add_comment', kwargs={'post_id': self.post.id}),
+                {'text': 'live comment'})
+        publish.assert_called_once_with(live.comments_topic(self.post.id))
+
+    def test_post_detail_renders_stream_hooks(self):
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}))
+        self.assertContains(response, f'data-comment-id="{self.new.id}"')
+        self.assertContains(response, self.url)
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import feed, follow_graph
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class NewPostsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create(username='test_reader')
+        cls.author = User.objects.create(username='test_author')
+        cls.group = Group.objects.create(
+            title='Test group', slug='test_slug', description='Test')
+        cls.old = Post.objects.create(text='old', author=cls.author)
+        cls.seen = Post.objects.create(
+            text='seen', author=cls.author, group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def since(self, post):
+        return {'since': feed.encode_cursor(feed.post_key(post))}
+
+    def test_nothing_new_answered_from_cache(self):
+        """Пока постов не прибавилось, Post не читается."""
+        url = reverse('posts:index_new_posts')
+        self.client.get(url, self.since(self.seen))
+        with self.assertNumQueries(0):
+            response = self.client.get(url, self.since(self.seen))
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_new_posts_counted_per_feed(self):
+        new_post = Post.objects.create(text='fresh text', author=self.reader)
+        urls = (
+            (reverse('posts:index_new_posts'), 1),
+            (reverse('posts:group_new_posts', args=('test_slug',)), 0),
+            (reverse('posts:profile_new_posts', args=('test_reader',)), 1),
+        )
+        for url, count in urls:
+            with self.subTest(url=url):
+                data = self.client.get(url, self.since(self.seen)).json()
+                self.assertEqual(data['count'], count)
+        data = self.client.get(urls[0][0], self.since(self.old)).json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['posts'][0]['text'], 'fresh text')
+        self.assertEqual(data['cursor'],
+                         feed.encode_cursor(feed.post_key(new_post)))
+
+    def test_follow_feed_depends_on_follows(self):
+        url = reverse('posts:follow_new_posts')
+        data = self.reader_client.get(url, self.since(self.old)).json()
+        self.assertEqual(data['count'], 0)
+        follow_graph.follow(self.reader.id, self.author.id)
+        data = self.reader_client.get(url, self.since(self.old)).json()
+        self.assertEqual(data['count'], 1)
+
+    def test_poller_only_on_first_page(self):
+        index = reverse('posts:index')
+        cursor = feed.encode_cursor(feed.post_key(self.seen))
+        self.assertContains(self.client.get(index), f'data-cursor="{cursor}"')
+        self.assertNotContains(
+            self.client.get(index, {'page': 2}), 'data-new-posts-url')
@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core import page_cache
+from ..models import Comment, Post
+
+User = get_user_model()
+
+
+class PageCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='test_author')
+        cls.reader = User.objects.create(username='test_reader')
+        cls.post = Post.objects.create(text='Test text', author=cls.author)
+        Comment.objects.create(
+            post=cls.post, author=cls.author, text='first comment')
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id})
+
+    def test_anonymous_page_cached_until_data_changes(self):
+        """Новый комментарий делает закэшированную страницу устаревшей."""
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'miss')
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'hit')
+        self.author_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.id}),
+            {'text': 'second comment'})
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'second comment')
+
+    def test_deleted_comment_leaves_cached_page(self):
+        """Комментарий, удаленный мимо модерации, пропадает со страницы."""
+        admin = User.objects.create_superuser(
+            'test_admin', 'admin@example.com', 'password')
+        admin_client = Client()
+        admin_client.force_login(admin)
+        commenter = User.objects.create(username='test_commenter')
+        deletions = {
+            'admin': lambda comment: admin_client.post(
+                reverse('admin:posts_comment_delete', args=(comment.pk,)),
+                {'post': 'yes'}),
+            'orm': lambda comment: Comment.objects.filter(
+                pk=comment.pk).delete(),
+            'cascade': lambda comment: commenter.delete(),
+        }
+        for way, delete in deletions.items():
+            with self.subTest(way=way):
+                comment = Comment.objects.create(
+                    post=self.post, author=commenter, text=f'by {way}')
+                self.assertContains(self.client.get(self.url), f'by {way}')
+                self.assertEqual(
+                    self.client.get(self.url)['X-Page-Cache'], 'hit')
+                delete(comment)
+                self.assertFalse(Comment.objects.filter(
+                    pk=comment.pk).exists())
+                self.assertNotContains(
+                    self.client.get(self.url), f'by {way}')
+
+    def test_query_string_is_part_of_key(self):
+        index = reverse('posts:index')
+        self.client.get(index)
+        response = self.client.get(index, {'page': 2})
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+    def test_logged_in_users_get_their_own_blocks(self):
+        """Вошедшим перерисовываются только личные блоки страницы."""
+        anonymous = self.client.get(self.url)
+        self.assertNotContains(anonymous, 'Добавить комментарий')
+        # Пользователь (сессия уже в кэше) и его подписки для кнопок
+        with self.assertNumQueries(2):
+            response = self.reader_client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'punched')
+        self.assertContains(response, 'Пользователь: test_reader')
+        self.assertContains(response, 'Добавить комментарий')
+        self.assertContains(response, 'Подписаться')
+        self.assertNotContains(response, 'Редактировать пост')
+        response = self.author_client.get(self.url)
+        self.assertContains(response, 'Пользователь: test_author')
+        self.assertContains(response, 'Редактировать пост')
+
+    def test_comment_follow_buttons_in_one_block(self):
+        """Кнопки подписки у комментариев не рендерятся блоком на каждый."""
+        for number in range(5):
+            Comment.objects.create(
+                post=self.post, author=self.reader, text=f'c{number}')
+        self.client.get(self.url)
+        with mock.patch.object(page_cache, 'render_to_string',
+                               wraps=page_cache.render_to_string) as render:
+            response = self.author_client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'punched')
+        self.assertContains(response, 'Подписаться', count=5)
+        templates = [call.args[0] for call in render.call_args_list]
+        self.assertEqual(templates.count('posts/includes/comments.html'), 1)
+        self.assertEqual(len(templates), len(set(templates)))
+
+    def test_cached_pages_keep_security_headers(self):
+        """Страницы из кэша защищены от встраивания так же, как ответ view."""
+        responses = (
+            self.client.get(self.url),
+            self.client.get(self.url),
+            self.reader_client.get(self.url),
+        )
+        for response, status in zip(responses, ('miss', 'hit', 'punched')):
+            with self.subTest(status=status):
+                self.assertEqual(response['X-Page-Cache'], status)
+                self.assertEqual(response['X-Frame-Options'], 'SAMEORIGIN')
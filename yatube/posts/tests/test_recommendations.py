@@ -0,0 +1,59 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Group, Post, Recommendation
+
+User = get_user_model()
+
+
+class RecommendationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.friend, cls.friend_of_friend, cls.group_author = [
+            User.objects.create(username=username) for username in (
+                'test_username', 'friend', 'friend_of_friend', 'writer')
+        ]
+        Follow.objects.create(user=cls.user, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.friend_of_friend)
+        group = Group.objects.create(
+            title='Test group', slug='test_slug', description='Test')
+        Post.objects.create(text='user post', author=cls.user, group=group)
+        Post.objects.create(
+            text='writer post', author=cls.group_author, group=group)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_recommendations_built(self):
+        """Друзья друзей и авторы общих групп попадают в рекомендации."""
+        call_command('recommend_follows', stdout=StringIO())
+        recommended = list(Recommendation.objects.filter(
+            user=self.user).values_list('author__username', flat=True))
+        self.assertEqual(recommended, ['friend_of_friend', 'writer'])
+
+    def test_stale_recommendations_removed(self):
+        """Пользователь вне графа подписок теряет старые рекомендации."""
+        loner = User.objects.create(username='loner')
+        Recommendation.objects.create(
+            user=loner, author=self.friend, score=1, rank=0)
+        call_command('recommend_follows', stdout=StringIO())
+        self.assertFalse(Recommendation.objects.filter(user=loner).exists())
+        self.assertTrue(
+            Recommendation.objects.filter(user=self.user).exists())
+
+    def test_recommendations_shown_on_follow_index(self):
+        """Лента подписок показывает рекомендации без уже прочитанных."""
+        Recommendation.objects.create(
+            user=self.user, author=self.friend_of_friend, score=1, rank=0)
+        Recommendation.objects.create(
+            user=self.user, author=self.friend, score=1, rank=1)
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.context['recommended_authors'],
+                         [self.friend_of_friend])
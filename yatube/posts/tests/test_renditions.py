@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.testing import small_image
+from ..models import Post
+from ..renditions import RENDITION_WIDTHS, get_renditions
+
+User = get_user_model()
+
+
+class RenditionsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='test_username')
+        for number in range(2):
+            Post.objects.create(text=f'post {number}', author=user,
+                                image=small_image(
+                                    f'image_{number}.png', (100, 50), 'PNG'))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_renditions_cover_all_widths(self):
+        renditions = get_renditions(Post.objects.first().image)
+        self.assertEqual(renditions['srcset'].count('w,'),
+                         len(RENDITION_WIDTHS) - 1)
+        self.assertIn('image/webp',
+                      [source['type'] for source in renditions['sources']])
+
+    def test_feed_uses_picture(self):
+        """Первая картинка ленты грузится сразу, остальные лениво."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, '<picture>', count=2)
+        self.assertContains(response, 'fetchpriority="high"', count=1)
+        self.assertContains(response, 'loading="lazy"', count=1)
+        self.assertContains(response, 'width="960" height="339"', count=2)
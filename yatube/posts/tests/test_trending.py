@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.models import Task
+from core.tasks import run_pending
+from .. import trending
+from ..models import Group, Post, TrendCounter
+
+User = get_user_model()
+
+
+@override_settings(TASKS_ALWAYS_EAGER=True)
+class TrendingTest(TransactionTestCase):
+    # Обычный TestCase не дает сработать transaction.on_commit,
+    # через который события попадают в очередь задач
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create(username='test_username')
+        self.author = User.objects.create(username='test_author')
+        self.group = Group.objects.create(
+            title='Test group', slug='test_slug', description='Test')
+        self.quiet_post = Post.objects.create(text='quiet', author=self.user)
+        self.hot_post = Post.objects.create(
+            text='hot', author=self.author, group=self.group)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def comment(self, post):
+        self.authorized_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': post.id}),
+            data={'text': 'comment'})
+
+    def test_comments_update_bucket_counters(self):
+        """Комментарии копятся в счетчике текущей корзины."""
+        self.comment(self.hot_post)
+        self.comment(self.hot_post)
+        counter = TrendCounter.objects.get(object_id=self.hot_post.id)
+        self.assertEqual(counter.count, 2)
+        self.assertEqual(counter.bucket, trending.current_bucket())
+
+    def test_trending_page_orders_by_activity(self):
+        """Активный пост и его группа попадают в топы."""
+        self.comment(self.quiet_post)
+        self.comment(self.hot_post)
+        self.comment(self.hot_post)
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(response.context['posts'],
+                         [self.hot_post, self.quiet_post])
+        self.assertEqual(response.context['trending_groups'], [self.group])
+        response = self.client.get(
+            reverse('posts:trending'), {'group': 'test_slug'})
+        self.assertEqual(response.context['posts'], [self.hot_post])
+
+    def test_old_buckets_decay_and_expire(self):
+        """Старые события весят меньше, а за окном удаляются."""
+        now = trending.current_bucket()
+        TrendCounter.objects.create(
+            kind=TrendCounter.POST, object_id=self.quiet_post.id,
+            bucket=now, count=1)
+        TrendCounter.objects.create(
+            kind=TrendCounter.POST, object_id=self.hot_post.id,
+            bucket=now - trending.HALF_LIFE_BUCKETS * 2, count=3)
+        TrendCounter.objects.create(
+            kind=TrendCounter.POST, object_id=self.hot_post.id + 1,
+            bucket=now - trending.TRENDING_WINDOW - 1, count=100)
+        top = trending.refresh()[trending.GLOBAL_KEY]
+        self.assertEqual(top, [self.quiet_post.id, self.hot_post.id])
+        self.assertEqual(TrendCounter.objects.count(), 2)
+
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_refresh_failure_does_not_replay_events(self):
+        """Сбой пересчета топов не применяет события повторно."""
+        self.comment(self.hot_post)
+        with mock.patch.object(trending, 'refresh',
+                               side_effect=RuntimeError('boom')):
+            run_pending()
+            run_pending()
+        counter = TrendCounter.objects.get(object_id=self.hot_post.id)
+        self.assertEqual(counter.count, 1)
+        refresh_task = Task.objects.get()
+        self.assertEqual(refresh_task.name, 'posts.trend_refresh')
+        self.assertEqual(refresh_task.attempts, 1)
+
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_page_queues_refresh_instead_of_computing(self):
+        """Без готовых топов страница не считает их, а ставит пересчет."""
+        TrendCounter.objects.create(
+            kind=TrendCounter.POST, object_id=self.hot_post.id,
+            author_id=self.author.id, bucket=trending.current_bucket(),
+            count=1)
+        with mock.patch.object(trending, 'refresh') as refresh:
+            for params in ({}, {'group': 'test_slug'}):
+                response = self.client.get(
+                    reverse('posts:trending'), params)
+                self.assertEqual(response.context['posts'], [])
+        refresh.assert_not_called()
+        self.assertEqual(
+            list(Task.objects.values_list('name', flat=True)),
+            ['posts.trend_refresh'])
+        run_pending()
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(response.context['posts'], [self.hot_post])
@@ -10,40 +10,29 @@ User = get_user_model()
 
 class PostURLTests(TestCase):
 
-    def setUp(self) -> None:
-        self.guest_client = Client()
-
-        self.authorized_user = User.objects.create(username='test_username')
-        self.authorized_client = Client()
-        self.authorized_client.force_login(self.authorized_user)
-
-        self.authorized_user_2 = User.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.authorized_user = User.objects.create(username='test_username')
+        cls.authorized_user_2 = User.objects.create(
             username='test_username_2'
         )
-        self.authorized_client_2 = Client()
-        self.authorized_client_2.force_login(self.authorized_user_2)
-
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-        Group.objects.create(
+        group = Group.objects.create(
             title='Test group',
             slug='test_slug',
             description='Test description',
         )
-        Post.objects.create(
+        cls.post = Post.objects.create(
             text='Test text',
-            author_id=1,
-            group_id=1,
+            author=cls.authorized_user,
+            group=group,
         )
-        cls.urls = {
-            '/': 'posts/index.html',
-            '/group/test_slug/': 'posts/group_list.html',
-            '/profile/test_username/': 'posts/profile.html',
-            '/posts/1/': 'posts/post_detail.html',
-            '/posts/1/edit/': 'posts/create_post.html',
-            '/create/': 'posts/create_post.html',
-        }
+
+    def setUp(self) -> None:
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.authorized_user)
+        self.authorized_client_2 = Client()
+        self.authorized_client_2.force_login(self.authorized_user_2)
 
     def test_urls_templates_authorized(self):
         """Проверка доступности страниц и
@@ -52,8 +41,8 @@ class PostURLTests(TestCase):
             '/': 'posts/index.html',
             '/group/test_slug/': 'posts/group_list.html',
             '/profile/test_username/': 'posts/profile.html',
-            '/posts/1/': 'posts/post_detail.html',
-            '/posts/1/edit/': 'posts/create_post.html',
+            f'/posts/{self.post.id}/': 'posts/post_detail.html',
+            f'/posts/{self.post.id}/edit/': 'posts/create_post.html',
             '/create/': 'posts/create_post.html',
         }
         for path, template in templates_urls.items():
@@ -68,7 +57,7 @@ class PostURLTests(TestCase):
             '/': 'posts/index.html',
             '/group/test_slug/': 'posts/group_list.html',
             '/profile/test_username/': 'posts/profile.html',
-            '/posts/1/': 'posts/post_detail.html',
+            f'/posts/{self.post.id}/': 'posts/post_detail.html',
         }
         for path, template in templates_urls.items():
             with self.subTest(address=path):
@@ -79,7 +68,7 @@ class PostURLTests(TestCase):
     def test_login_required_unauthorized(self):
         """Проверка URL для гостя, в которых необходима авторизация"""
         templates_urls = {
-            '/posts/1/edit/': 'posts/create_post.html',
+            f'/posts/{self.post.id}/edit/': 'posts/create_post.html',
             '/create/': 'posts/create_post.html',
         }
         for path, template in templates_urls.items():
@@ -92,6 +81,6 @@ class PostURLTests(TestCase):
         """Проверка редиректа при редактировании поста
         несоответствующим пользователем."""
         response = self.authorized_client_2.get(
-            reverse('posts:post_edit', kwargs={'post_id': 1}))
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}))
         self.assertRedirects(response, reverse(
-            'posts:post_detail', kwargs={'post_id': 1}))
+            'posts:post_detail', kwargs={'post_id': self.post.id}))
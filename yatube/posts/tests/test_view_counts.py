@@ -0,0 +1,75 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import view_counts
+from ..models import Post
+
+User = get_user_model()
+
+
+@override_settings(VIEW_COUNTS_FLUSH_INTERVAL=60 * 60)
+class ViewCountsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='test_reader')
+        cls.posts = [
+            Post.objects.create(text=f'post {number}', author=cls.user)
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        view_counts._pending.clear()
+        view_counts._last_flush = time.monotonic()
+
+    def test_views_buffered_until_flush(self):
+        """Просмотры попадают в базу одним UPDATE при сбросе."""
+        first, second, _ = self.posts
+        for post in (first, first, second):
+            view_counts.record_view(post.id)
+        self.assertEqual(Post.objects.get(pk=first.pk).views, 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(view_counts.flush(), 2)
+        views = dict(Post.objects.values_list('pk', 'views'))
+        self.assertEqual(views, {first.pk: 2, second.pk: 1,
+                                 self.posts[2].pk: 0})
+
+    def test_views_flushed_without_new_requests(self):
+        """Первый просмотр запускает фоновый сброс и сброс при выходе."""
+        with override_settings(VIEW_COUNTS_BACKGROUND_FLUSH=True), \
+                mock.patch.object(view_counts, '_flusher', None), \
+                mock.patch.object(view_counts.threading, 'Thread') as thread, \
+                mock.patch.object(view_counts.atexit, 'register') as register:
+            view_counts.record_view(self.posts[0].id)
+            view_counts.record_view(self.posts[1].id)
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once_with()
+        register.assert_called_once_with(view_counts.flush)
+
+    def test_page_cache_hits_are_counted(self):
+        post = self.posts[0]
+        url = reverse('posts:post_detail', kwargs={'post_id': post.id})
+        self.client.get(url)
+        reader = Client()
+        reader.force_login(self.user)
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'hit')
+        self.assertEqual(reader.get(url)['X-Page-Cache'], 'punched')
+        view_counts.flush()
+        post.refresh_from_db()
+        self.assertEqual(post.views, 3)
+
+    def test_counts_shown_on_pages(self):
+        post = self.posts[0]
+        view_counts.record_view(post.id)
+        view_counts.flush()
+        for url in (
+            reverse('posts:post_detail', kwargs={'post_id': post.id}),
+            reverse('posts:profile', kwargs={'username': 'test_reader'}),
+        ):
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Просмотров: 1')
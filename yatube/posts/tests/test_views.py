@@ -1,56 +1,36 @@
-import shutil
-import tempfile
-
-from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.core.cache import cache
+from django.test import Client, TestCase
 from django.urls import reverse
 from django import forms
 from django.db.models.fields.files import ImageFieldFile
 
+from core.testing import small_image
 from ..models import Post, Group, Follow
 
 User = get_user_model()
 POSTS_AMOUNT = 17
 PAGINATOR_REQUIRED_AMOUNT = 10
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostPagesTest(TestCase):
-    def setUp(self) -> None:
-        self.authorized_client = User.objects.create(username='test_username')
-        self.authorized_user = Client()
-        self.authorized_user.force_login(self.authorized_client)
-
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-        Group.objects.create(slug='test-slug', title='test group name')
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='test_username')
+        group = Group.objects.create(slug='test-slug', title='test group name')
         # Создаем 17 постов для проверки работы паджинатора
         for post in range(POSTS_AMOUNT):
-            Post.objects.create(
+            cls.post = Post.objects.create(
                 text='Test text',
-                author_id=1,
-                group_id=1,
-                image=SimpleUploadedFile(
-                    name='test_image.jpg',
-                    content_type='image/jpeg',
-                    content=b'\x47\x49\x46\x38\x39'
-                            b'\x61\x01\x00\x01\x00'
-                            b'\x00\x00\x00\x21\xf9\x04'
-                            b'\x01\x0a\x00\x01\x00'
-                            b'\x2c\x00\x00\x00\x00'
-                            b'\x01\x00\x01\x00\x00\x02'
-                            b'\x02\x4c\x01\x00\x3b'
-                ),
+                author=cls.user,
+                group=group,
+                image=small_image('test_image.gif'),
             )
 
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+    def setUp(self) -> None:
+        cache.clear()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
 
     def test_html_templates_views(self):
         """Проверка соответствия view классов ожидаемым шаблонам."""
@@ -61,10 +41,10 @@ class PostPagesTest(TestCase):
             reverse('posts:profile',
                     kwargs={
                         'username': 'test_username'}): 'posts/profile.html',
-            reverse('posts:post_detail',
-                    kwargs={'post_id': '1'}): 'posts/post_detail.html',
-            reverse('posts:post_edit',
-                    kwargs={'post_id': '1'}): 'posts/create_post.html',
+            reverse('posts:post_detail', kwargs={
+                'post_id': self.post.id}): 'posts/post_detail.html',
+            reverse('posts:post_edit', kwargs={
+                'post_id': self.post.id}): 'posts/create_post.html',
             reverse('posts:post_create', ): 'posts/create_post.html',
         }
         for reverse_name, template in templates_urls.items():
@@ -107,7 +87,7 @@ class PostPagesTest(TestCase):
     def test_post_detail_page_shows_correct_context(self):
         """Проверка подробной информации о посте"""
         response = self.client.get(
-            reverse('posts:post_detail', kwargs={'post_id': '1'}))
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}))
         self.assertEqual(response.context.get('post').text, 'Test text')
         self.assertEqual(response.context.get('title'), 'Test text')
         self.assertEqual(
@@ -118,7 +98,7 @@ class PostPagesTest(TestCase):
     def test_post_edit_page_is_correct(self):
         """Проверка контекста страницы редактирования поста."""
         response = self.authorized_user.get(
-            reverse('posts:post_edit', kwargs={'post_id': '1'}))
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}))
         self.assertEqual(response.context.get('post').text, 'Test text')
         self.assertIsInstance(
             response.context.get('form').fields.get('text'),
@@ -161,29 +141,27 @@ class PostPagesTest(TestCase):
     def test_following_unfollowing(self):
         """ Проверка на подписку и отписку от пользователя."""
         # Создаем второго пользователя
-        self.authorized_client_2 = User.objects.create(
-            username='test_username_2')
+        author = User.objects.create(username='test_username_2')
         # Проверка подписки
         self.authorized_user.post(
             reverse('posts:profile_follow',
                     kwargs={'username': 'test_username_2'})
         )
         self.assertTrue(Follow.objects.filter(
-            user_id=1, author_id=2).exists())
+            user=self.user, author=author).exists())
         # Проверка отписки
         self.authorized_user.post(
             reverse('posts:profile_unfollow',
                     kwargs={'username': 'test_username_2'}))
         self.assertFalse(Follow.objects.filter(
-            user_id=1, author_id=2).exists())
+            user=self.user, author=author).exists())
 
     def test_following_post_are_shown(self):
         """ Проверка на отображение постов в follow."""
-        self.authorized_client_2 = User.objects.create(
-            username='test_username_2')
+        author = User.objects.create(username='test_username_2')
         Post.objects.create(
             text='test text for followers',
-            author_id=2,
+            author=author,
         )
         self.authorized_user.post(
             reverse('posts:profile_follow',
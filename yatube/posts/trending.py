@@ -0,0 +1,142 @@
+"""Популярные посты и группы по скользящему окну счетчиков.
+
+Комментарии и новые подписки не считаются по таблицам: каждое событие
+через очередь задач увеличивает счетчик своей часовой корзины в
+TrendCounter. Пересчет читает только корзины окна TRENDING_WINDOW,
+взвешивает их с затуханием и кладет готовые топы в кэш, поэтому его
+стоимость зависит от числа активных объектов, а не от размера таблиц.
+
+Пересчет идет только в задаче posts.trend_refresh. Страница читает
+готовые топы; если они старше TRENDING_TIMEOUT или их еще нет, она
+отдает последние известные (или пустые) и ставит пересчет в очередь.
+"""
+import time
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from core.tasks import enqueue
+from .models import TrendCounter
+
+BUCKET_SECONDS = 60 * 60
+TRENDING_WINDOW = 48
+HALF_LIFE_BUCKETS = 6
+TRENDING_TOP = 20
+AUTHOR_GROWTH_WEIGHT = 0.5
+TRENDING_TIMEOUT = 60 * 60
+# Пока пересчет в очереди, страницы не ставят его повторно
+REFRESH_QUEUED_TIMEOUT = 60
+
+GLOBAL_KEY = 'trending:posts:global'
+GROUPS_KEY = 'trending:groups'
+GROUP_IDS_KEY = 'trending:posts:group_ids'
+FRESH_KEY = 'trending:fresh'
+REFRESH_QUEUED_KEY = 'trending:refresh_queued'
+
+
+def _group_key(group_id):
+    return f'trending:posts:group:{group_id}'
+
+
+def current_bucket():
+    return int(time.time() // BUCKET_SECONDS)
+
+
+def record_comment(post):
+    enqueue('posts.trend_events', kind=TrendCounter.POST, object_id=post.id,
+            author_id=post.author_id, group_id=post.group_id,
+            bucket=current_bucket())
+
+
+def record_follow(author_id):
+    enqueue('posts.trend_events', kind=TrendCounter.AUTHOR,
+            object_id=author_id, author_id=None, group_id=None,
+            bucket=current_bucket())
+
+
+def apply_events(events):
+    """Сворачивает пачку событий и прибавляет их к счетчикам корзин.
+
+    Пачка применяется одной транзакцией: при ошибке (в том числе при
+    гонке двух обработчиков за новую корзину) не остается частично
+    прибавленных счетчиков, и повтор задачи не посчитает их дважды.
+    """
+    totals = Counter(
+        (event['kind'], event['object_id'], event['author_id'],
+         event['group_id'], event['bucket'])
+        for event in events
+    )
+    with transaction.atomic():
+        for (kind, object_id, author_id, group_id, bucket), count in (
+                totals.items()):
+            updated = TrendCounter.objects.filter(
+                kind=kind, object_id=object_id, bucket=bucket,
+            ).update(count=F('count') + count)
+            if not updated:
+                TrendCounter.objects.create(
+                    kind=kind, object_id=object_id, author_id=author_id,
+                    group_id=group_id, bucket=bucket, count=count)
+
+
+def _top(scores):
+    return [object_id for object_id, _ in sorted(
+        scores.items(), key=lambda item: -item[1])[:TRENDING_TOP]]
+
+
+def refresh():
+    """Пересчитывает топы по корзинам окна и удаляет устаревшие."""
+    now = current_bucket()
+    oldest = now - TRENDING_WINDOW
+    TrendCounter.objects.filter(bucket__lt=oldest).delete()
+    post_scores = defaultdict(float)
+    post_meta = {}
+    author_scores = defaultdict(float)
+    counters = TrendCounter.objects.filter(bucket__gte=oldest).values_list(
+        'kind', 'object_id', 'author_id', 'group_id', 'bucket', 'count')
+    for kind, object_id, author_id, group_id, bucket, count in counters:
+        weight = count * 0.5 ** ((now - bucket) / HALF_LIFE_BUCKETS)
+        if kind == TrendCounter.POST:
+            post_scores[object_id] += weight
+            post_meta[object_id] = (author_id, group_id)
+        else:
+            author_scores[object_id] += weight
+    by_group = defaultdict(dict)
+    group_scores = defaultdict(float)
+    for post_id, score in post_scores.items():
+        author_id, group_id = post_meta[post_id]
+        score += AUTHOR_GROWTH_WEIGHT * author_scores.get(author_id, 0)
+        post_scores[post_id] = score
+        if group_id is not None:
+            by_group[group_id][post_id] = score
+            group_scores[group_id] += score
+    values = {GLOBAL_KEY: _top(post_scores), GROUPS_KEY: _top(group_scores),
+              GROUP_IDS_KEY: list(by_group)}
+    for group_id, scores in by_group.items():
+        values[_group_key(group_id)] = _top(scores)
+    # Топы хранятся без срока: до следующего пересчета страницы
+    # отдают последние известные. Топы групп, выпавших из окна, удаляются
+    dropped = set(cache.get(GROUP_IDS_KEY, ())) - set(by_group)
+    cache.delete_many([_group_key(group_id) for group_id in dropped])
+    cache.set_many(values, None)
+    cache.set(FRESH_KEY, True, TRENDING_TIMEOUT)
+    cache.delete(REFRESH_QUEUED_KEY)
+    return values
+
+
+def _cached_top(key):
+    values = cache.get_many([key, FRESH_KEY])
+    if FRESH_KEY not in values and cache.add(
+            REFRESH_QUEUED_KEY, True, REFRESH_QUEUED_TIMEOUT):
+        enqueue('posts.trend_refresh')
+    return values.get(key, [])
+
+
+def trending_post_ids(group_id=None):
+    return _cached_top(
+        GLOBAL_KEY if group_id is None else _group_key(group_id))
+
+
+def trending_group_ids():
+    return _cached_top(GROUPS_KEY)
@@ -5,16 +5,40 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('new/', views.index_new_posts, name='index_new_posts'),
+    path('trending/', views.trending_posts, name='trending'),
+    path('groups/', views.group_directory, name='group_directory'),
+    path(
+        'groups/autocomplete/',
+        views.group_autocomplete,
+        name='group_autocomplete'
+    ),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path(
+        'group/<slug:slug>/new/',
+        views.group_new_posts,
+        name='group_new_posts'
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/new/',
+        views.profile_new_posts,
+        name='profile_new_posts'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment,
         name='add_comment'),
+    path(
+        'posts/<int:post_id>/comments/stream/',
+        views.comment_stream,
+        name='comment_stream'
+    ),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path('create/', views.post_create, name='post_create'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('follow/new/', views.follow_new_posts, name='follow_new_posts'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -25,4 +49,9 @@ urlpatterns = [
         views.profile_unfollow,
         name='profile_unfollow'
     ),
+    path(
+        'profile/<str:username>/export/',
+        views.profile_export,
+        name='profile_export'
+    ),
 ]
@@ -1,11 +1,25 @@
+from django.db.models import F
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 
-from .models import Post, Group, User, Comment, Follow
+from core.tasks import enqueue
+
+from . import (feed, follow_graph, group_choices, live, new_posts,
+               trending, view_counts)
+from .models import Post, Group, User, Comment
+from .export import EXPORT_FORMATS
 from .forms import PostForm, CommentForm
 from .paginators import my_paginator
+from .recommendations import recommended_authors
+from .signals import POSTS_VERSION
 
 POST_DETAIL_FIRST_LETTERS = 30
+GROUP_DIRECTORY_ORDERING = {
+    'activity': (F('stats__last_post_at').desc(nulls_last=True), 'title'),
+    'posts': (F('stats__posts_count').desc(nulls_last=True), 'title'),
+    'title': ('title',),
+}
 
 
 def index(request):
@@ -14,6 +28,46 @@ def index(request):
     return render(request, 'posts/index.html', {'page_obj': page_obj})
 
 
+def trending_posts(request):
+    group = None
+    slug = request.GET.get('group')
+    if slug:
+        group = get_object_or_404(Group, slug=slug)
+    post_ids = trending.trending_post_ids(group.id if group else None)
+    posts = Post.objects.select_related('author', 'group').in_bulk(post_ids)
+    group_ids = trending.trending_group_ids()
+    groups = Group.objects.in_bulk(group_ids)
+    context = {
+        'posts': [posts[pk] for pk in post_ids if pk in posts],
+        'group': group,
+        'trending_groups': [groups[pk] for pk in group_ids if pk in groups],
+    }
+    return render(request, 'posts/trending.html', context)
+
+
+def group_directory(request):
+    groups = Group.objects.select_related('stats')
+    query = request.GET.get('q', '').strip()
+    if query:
+        groups = groups.filter(title__icontains=query)
+    sort = request.GET.get('sort')
+    if sort not in GROUP_DIRECTORY_ORDERING:
+        sort = 'activity'
+    groups = groups.order_by(*GROUP_DIRECTORY_ORDERING[sort])
+    context = {
+        'page_obj': my_paginator(groups, request),
+        'query': query,
+        'sort': sort,
+    }
+    return render(request, 'posts/group_directory.html', context)
+
+
+def group_autocomplete(request):
+    groups = group_choices.search_groups(request.GET.get('q', ''))
+    return JsonResponse(
+        {'results': [{'id': pk, 'text': title} for pk, title in groups]})
+
+
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
     posts = group.posts.select_related('author', 'group')
@@ -27,29 +81,24 @@ def profile(request, username):
     author = User.objects.get(username=username)
     posts = author.posts.select_related('group')
     page_obj = my_paginator(posts, request)
-    if request.user.is_authenticated:
-        following = Follow.objects.filter(
-            user_id=request.user,
-            author_id=author.id,
-        ).exists()
-    else:
-        following = False
     context = {
         'posts_count': posts.count(),
         'posts': posts,
         'page_obj': page_obj,
         'author': author,
-        'following': following,
+        'followers_count': follow_graph.get_followers_count(author.id),
     }
     return render(request, 'posts/profile.html', context)
 
 
 def post_detail(request, post_id):
     post = Post.objects.select_related('group').get(id=post_id)
+    view_counts.record_view(post.id)
     title = str(post)[:POST_DETAIL_FIRST_LETTERS]
     author_total_posts = Post.objects.filter(author=post.author).count()
     comment_form = CommentForm()
-    comments = Comment.objects.filter(post=post_id)
+    comments = Comment.objects.filter(
+        post=post_id).select_related('author').order_by('id')
     context = {
         'post': post,
         'title': title,
@@ -71,15 +120,21 @@ def post_create(request):
             post = form.save(commit=False)
             post.author = request.user
             post.save()
+            if post.image:
+                enqueue('posts.warm_thumbnails', post_id=post.id)
             return redirect('posts:profile', request.user)
     form = PostForm()
-    return render(request, 'posts/create_post.html', {'form': form})
+    return render(request, 'posts/create_post.html', {
+        'form': form,
+        # Фрагмент формы со списком групп устаревает вместе с ним
+        'groups_version': group_choices.groups_version(),
+    })
 
 
 @login_required
 def post_edit(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
-    if post.author != request.user:
+    if post.author_id != request.user.id:
         return redirect('posts:post_detail', post_id=post_id)
 
     form = PostForm(
@@ -88,7 +143,9 @@ def post_edit(request, post_id):
         instance=post
     )
     if form.is_valid():
-        form.save()
+        post = form.save()
+        if 'image' in form.changed_data and post.image:
+            enqueue('posts.warm_thumbnails', post_id=post.id)
         return redirect('posts:post_detail', post_id=post_id)
     context = {
         'post': post,
@@ -107,35 +164,110 @@ def add_comment(request, post_id):
         comment.author = request.user
         comment.post = post
         comment.save()
+        trending.record_comment(post)
+        live.publish_comment(comment)
     return redirect('posts:post_detail', post_id=post_id)
 
 
+def comment_stream(request, post_id):
+    """Новые комментарии поста потоком Server-Sent Events."""
+    get_object_or_404(Post.objects.only('id'), pk=post_id)
+    last_id = (request.META.get('HTTP_LAST_EVENT_ID')
+               or request.GET.get('after'))
+    if last_id is None or not last_id.isdigit():
+        # Без отметки клиента поток начинается с новых комментариев
+        last_id = Comment.objects.filter(post_id=post_id).order_by(
+            '-id').values_list('id', flat=True).first() or 0
+    response = StreamingHttpResponse(
+        live.open_stream(request, post_id, int(last_id)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # nginx иначе копит поток в буфере
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 def follow_index(request):
-    following_list = Follow.objects.filter(
-        user_id=request.user).values_list('author_id')
+    following_list = follow_graph.get_followees(request.user.id)
+    if len(following_list) >= feed.FEED_MERGE_THRESHOLD:
+        cursor = feed.decode_cursor(request.GET.get('cursor'))
+        context = {
+            'page_obj': feed.get_feed_page(following_list, cursor),
+            'cursor_pagination': True,
+            'recommended_authors': recommended_authors(request.user),
+        }
+        return render(request, 'posts/follow.html', context)
     posts = Post.objects.select_related('group', 'author').filter(
         author_id__in=following_list)
     page_obj = my_paginator(posts, request)
-    context = {'page_obj': page_obj}
+    context = {
+        'page_obj': page_obj,
+        'recommended_authors': recommended_authors(request.user),
+    }
     return render(request, 'posts/follow.html', context)
 
 
 @login_required
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
-    if author.id != request.user.id:
-        Follow.objects.get_or_create(
-            user_id=request.user.id,
-            author_id=author.id
-        )
+    if (author.id != request.user.id
+            and follow_graph.follow(request.user.id, author.id)):
+        trending.record_follow(author.id)
     return redirect('posts:profile', author)
 
 
 @login_required
 def profile_unfollow(request, username):
     user_to_unfollow = get_object_or_404(User, username=username)
-    Follow.objects.filter(
-        user_id=request.user.id,
-        author_id=user_to_unfollow.id).delete()
+    follow_graph.unfollow(request.user.id, user_to_unfollow.id)
     return redirect('posts:profile', user_to_unfollow)
+
+
+@login_required
+def profile_export(request, username):
+    author = get_object_or_404(User, username=username)
+    if author != request.user and not request.user.is_staff:
+        return redirect('posts:profile', author)
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'ndjson'
+    exporter, content_type, extension = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(exporter(author),
+                                     content_type=content_type)
+    response['Content-Disposition'] = (
+        f'attachment; filename="{author.username}.{extension}"'
+    )
+    return response
+
+
+def _new_posts_response(request, feed_key, posts, stamps=(POSTS_VERSION,)):
+    cursor = feed.decode_cursor(request.GET.get('since'))
+    return JsonResponse(
+        new_posts.new_posts(feed_key, posts, stamps, cursor))
+
+
+def index_new_posts(request):
+    return _new_posts_response(request, 'index', Post.objects.all())
+
+
+def group_new_posts(request, slug):
+    return _new_posts_response(
+        request, f'group:{slug}', Post.objects.filter(group__slug=slug),
+        (POSTS_VERSION, group_choices.GROUPS_VERSION))
+
+
+def profile_new_posts(request, username):
+    return _new_posts_response(
+        request, f'profile:{username}',
+        Post.objects.filter(author__username=username))
+
+
+@login_required
+def follow_new_posts(request):
+    followees = follow_graph.get_followees(request.user.id)
+    return _new_posts_response(
+        request, f'follow:{request.user.id}',
+        Post.objects.filter(author_id__in=followees),
+        (POSTS_VERSION, follow_graph.FOLLOWS_VERSION))
@@ -0,0 +1,58 @@
+from django import forms
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from .group_choices import group_choices
+
+
+class GroupAutocomplete(forms.Select):
+    """Выбор группы, в котором отрендерена только выбранная группа.
+
+    Остальные варианты скрипт подгружает поиском с group_autocomplete,
+    поэтому размер формы не зависит от числа групп. Без JavaScript
+    вместо него показывается полный список из <noscript>; его поле
+    <name>_all браузер отправляет только тогда, когда скрипты выключены.
+    """
+    fallback_suffix = '_all'
+
+    class Media:
+        js = ('posts/js/group_autocomplete.js',)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(
+            'posts:group_autocomplete')
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        selected = {str(pk) for pk in value if pk not in (None, '')}
+        choices = [('', '---------')]
+        if selected:
+            choices += [(pk, title) for pk, title in group_choices()
+                        if str(pk) in selected]
+        all_choices, self.choices = self.choices, choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
+
+    def render(self, name, value, attrs=None, renderer=None):
+        html = super().render(name, value, attrs, renderer)
+        selected = {str(pk) for pk in self.format_value(value)}
+        options = format_html_join('', '<option value="{}"{}>{}</option>', (
+            (pk, mark_safe(' selected') if str(pk) in selected else '',
+             title)
+            for pk, title in group_choices()
+        ))
+        return format_html(
+            '{}<noscript><style>select[data-autocomplete-url]'
+            '{{display: none}}</style><select name="{}" '
+            'class="form-control"><option value="">---------</option>{}'
+            '</select></noscript>',
+            html, name + self.fallback_suffix, options)
+
+    def value_from_datadict(self, data, files, name):
+        if name + self.fallback_suffix in data:
+            return data.get(name + self.fallback_suffix)
+        return super().value_from_datadict(data, files, name)
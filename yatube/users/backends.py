@@ -0,0 +1,32 @@
+"""Авторизация с кэшированным пользователем.
+
+AuthenticationMiddleware на каждом запросе вошедшего пользователя
+загружает его из базы; здесь объект берется из кэша. Запись удаляется
+при любом сохранении пользователя (смена пароля, блокировка в админке),
+а USER_CACHE_TIMEOUT ограничивает, сколько другой процесс с локальным
+кэшем может видеть старые данные.
+"""
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_TIMEOUT = 60 * 5
+
+
+def user_key(user_id):
+    return f'user:{user_id}'
+
+
+def forget(user_id):
+    cache.delete(user_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
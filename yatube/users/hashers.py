@@ -0,0 +1,61 @@
+"""Хэшеры паролей с параметрами, подобранными командой bench_hashers.
+
+Цель — около 50 мс на проверку пароля на одном ядре: вход и
+регистрация нагружают процессор предсказуемо, а перебор утекших хэшей
+остается дорогим. Если параметры или первый хэшер в PASSWORD_HASHERS
+меняются, старый хэш пересчитывается при следующем входе пользователя.
+"""
+from django.contrib.auth.hashers import (Argon2PasswordHasher,
+                                         BCryptSHA256PasswordHasher)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id с параметрами OWASP: 19 МиБ памяти, 2 прохода, 1 поток.
+
+    Штатный хэшер Django 2.2 всегда пишет Argon2i, для которого эти
+    параметры не рассчитаны, поэтому тип задан явно. Хэши Argon2i
+    проверяются своим типом и пересчитываются при следующем входе.
+    """
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
+
+    def encode(self, password, salt):
+        argon2 = self._load_library()
+        data = argon2.low_level.hash_secret(
+            password.encode(),
+            salt.encode(),
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism,
+            hash_len=argon2.DEFAULT_HASH_LENGTH,
+            type=argon2.low_level.Type.ID,
+        )
+        return self.algorithm + data.decode('ascii')
+
+    def verify(self, password, encoded):
+        argon2 = self._load_library()
+        algorithm, rest = encoded.split('$', 1)
+        assert algorithm == self.algorithm
+        variety = rest.split('$', 1)[0]
+        # argon2i -> Type.I, argon2id -> Type.ID
+        hash_type = getattr(
+            argon2.low_level.Type, variety[len('argon2'):].upper(), None)
+        if hash_type is None:
+            return False
+        try:
+            return argon2.low_level.verify_secret(
+                ('$' + rest).encode('ascii'),
+                password.encode(),
+                type=hash_type,
+            )
+        except argon2.exceptions.VerificationError:
+            return False
+
+    def must_update(self, encoded):
+        variety = self._decode(encoded)[1]
+        return variety != 'argon2id' or super().must_update(encoded)
+
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    rounds = 12
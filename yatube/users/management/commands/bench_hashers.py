@@ -0,0 +1,56 @@
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand
+
+from users.hashers import (TunedArgon2PasswordHasher,
+                           TunedBCryptSHA256PasswordHasher)
+
+BENCH_PASSWORD = 'correct horse battery staple'
+# Перебираемые параметры: (хэшер, атрибут, значения)
+GRIDS = (
+    (TunedArgon2PasswordHasher, 'memory_cost',
+     (8 * 1024, 19 * 1024, 46 * 1024, 64 * 1024)),
+    (TunedBCryptSHA256PasswordHasher, 'rounds', (10, 11, 12, 13)),
+    (PBKDF2PasswordHasher, 'iterations', (150000, 260000, 390000)),
+)
+
+
+class Command(BaseCommand):
+    help = ('Замер времени проверки пароля для параметров хэшеров; '
+            'помогает выбрать параметры users.hashers под цель в мс.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--target-ms', type=float, default=50)
+
+    def bench(self, hasher, iterations):
+        encoded = hasher.encode(BENCH_PASSWORD, hasher.salt())
+        started = time.perf_counter()
+        for _ in range(iterations):
+            hasher.verify(BENCH_PASSWORD, encoded)
+        return (time.perf_counter() - started) / iterations
+
+    def handle(self, *args, **options):
+        target = options['target_ms'] / 1000
+        for hasher_class, attribute, values in GRIDS:
+            hasher = hasher_class()
+            try:
+                if hasher.library:
+                    hasher._load_library()
+            except ValueError:
+                self.stdout.write(
+                    f'{hasher.algorithm}: библиотека не установлена')
+                continue
+            current = getattr(hasher_class, attribute)
+            for value in values:
+                setattr(hasher, attribute, value)
+                seconds = self.bench(hasher, options['iterations'])
+                marks = []
+                if value == current:
+                    marks.append('текущее')
+                if seconds <= target:
+                    marks.append('в пределах цели')
+                self.stdout.write(
+                    f'{hasher.algorithm} {attribute}={value}: '
+                    f'{seconds * 1000:.1f} мс {", ".join(marks)}'.rstrip())
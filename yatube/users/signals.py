@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import backends
+
+User = get_user_model()
+
+
+# Смена пароля во views users сохраняет пользователя, и кэш сбрасывается:
+# сессии со старым хэшем пароля сразу перестают действовать
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    backends.forget(instance.pk)
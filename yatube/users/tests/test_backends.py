@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class CachedAuthTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='auth', password='old-password-123')
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username='auth', password='old-password-123')
+
+    def test_session_and_user_from_cache(self):
+        """Повторный запрос не читает ни сессию, ни пользователя из базы."""
+        url = reverse('about:author')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_invalidates_cached_user(self):
+        """После смены пароля другие сессии пользователя закрываются."""
+        other = self.client_class()
+        other.login(username='auth', password='old-password-123')
+        other.get(reverse('about:author'))
+        self.client.post(reverse('users:password_change'), {
+            'old_password': 'old-password-123',
+            'new_password1': 'new-password-456',
+            'new_password2': 'new-password-456',
+        })
+        response = other.get(reverse('about:author'))
+        self.assertFalse(response.context['user'].is_authenticated)
+        response = self.client.get(reverse('about:author'))
+        self.assertTrue(response.context['user'].is_authenticated)
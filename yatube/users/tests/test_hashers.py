@@ -0,0 +1,58 @@
+from importlib.util import find_spec
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (Argon2PasswordHasher,
+                                         make_password)
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..hashers import TunedArgon2PasswordHasher
+
+User = get_user_model()
+
+
+class PasswordHashersTest(TestCase):
+    def test_fast_hasher_in_tests(self):
+        self.assertEqual(settings.PASSWORD_HASHERS,
+                         ['django.contrib.auth.hashers.MD5PasswordHasher'])
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.SHA1PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_password_rehashed_on_login(self):
+        """Хэш старым хэшером пересчитывается первым хэшером при входе."""
+        user = User.objects.create(
+            username='legacy',
+            password=make_password('legacy-password', hasher='md5'))
+        self.client.post(reverse('users:login'), {
+            'username': 'legacy', 'password': 'legacy-password'})
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('sha1$'))
+        self.assertTrue(user.check_password('legacy-password'))
+
+
+@skipUnless(find_spec('argon2'), 'argon2-cffi не установлен')
+class TunedArgon2PasswordHasherTest(TestCase):
+    def setUp(self):
+        self.hasher = TunedArgon2PasswordHasher()
+
+    def test_encodes_argon2id(self):
+        encoded = self.hasher.encode('password', self.hasher.salt())
+        self.assertTrue(encoded.startswith('argon2$argon2id$'))
+        self.assertIn('m=19456,t=2,p=1', encoded)
+        self.assertTrue(self.hasher.verify('password', encoded))
+        self.assertFalse(self.hasher.verify('wrong', encoded))
+        self.assertFalse(self.hasher.must_update(encoded))
+
+    def test_argon2i_hash_accepted_and_upgraded(self):
+        legacy = Argon2PasswordHasher()
+        legacy.time_cost = self.hasher.time_cost
+        legacy.memory_cost = self.hasher.memory_cost
+        legacy.parallelism = self.hasher.parallelism
+        encoded = legacy.encode('password', legacy.salt())
+        self.assertTrue(encoded.startswith('argon2$argon2i$'))
+        self.assertTrue(self.hasher.verify('password', encoded))
+        self.assertTrue(self.hasher.must_update(encoded))
@@ -10,7 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
+import atexit
 import os
+import shutil
+import sys
+import tempfile
+from importlib.util import find_spec
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,7 +27,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SECRET_KEY = 'bh17xaim87#+l$@h&85o83s(4ogrb*ha94@hw&b2i=7y()%ixl'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv('DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -49,25 +54,40 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Выше кэша страниц: заголовок нужен и страницам, отданным из кэша
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.AnonymousPageCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.PunchedPageCacheMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATE_LOADERS = [
+    'core.template_loaders.FilesystemLoader',
+    'core.template_loaders.AppDirectoriesLoader',
+]
+# В production шаблоны и их include компилируются один раз на процесс;
+# TEMPLATE_CACHE=1 включает то же поведение и при отладке
+if not DEBUG or os.getenv('TEMPLATE_CACHE') == '1':
+    TEMPLATE_LOADERS = [
+        ('core.template_loaders.CachedLoader', TEMPLATE_LOADERS),
+    ]
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -110,6 +130,17 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Первый хэшер шифрует новые пароли, остальные проверяют старые хэши;
+# при входе старый хэш пересчитывается первым хэшером
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+if find_spec('bcrypt'):
+    PASSWORD_HASHERS.insert(0, 'users.hashers.TunedBCryptSHA256PasswordHasher')
+if find_spec('argon2'):
+    PASSWORD_HASHERS.insert(0, 'users.hashers.TunedArgon2PasswordHasher')
+
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
 
@@ -128,6 +159,14 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+if not DEBUG:
+    # Хэшированные имена и .gz/.br варианты; нужен collectstatic
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Сессии и пользователь читаются из кэша, база нужна только при промахе
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -137,12 +176,79 @@ CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Штатный PIL-движок sorl-thumbnail не работает с Pillow 10
+THUMBNAIL_ENGINE = 'posts.thumbnail_engine.Engine'
+
+# Кэш в памяти процесса годится для разработки. При нескольких процессах
+# с PAGE_CACHE_VIEWS нужен общий кэш (memcached, redis): иначе версии
+# данных расходятся между процессами, см. проверку core.W001
 CACHES = {
+    # Обертка для профилировщика, данные хранит кэш 'store'
     'default': {
+        'BACKEND': 'core.cache.ProfiledCache',
+        'LOCATION': 'store',
+    },
+    'store': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    },
 }
 
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
+
+# Загрузчики заданы явно, шаблоны debug_toolbar находит AppDirectoriesLoader
+SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
+
+# Фоновые задачи: True выполняет их сразу после коммита, без run_tasks
+TASKS_ALWAYS_EAGER = False
+
+# Кэш страниц: view и наборы данных, от версий которых зависит страница
+PAGE_CACHE_VIEWS = {
+    'posts:index': ('posts', 'groups'),
+    'posts:group_list': ('posts', 'groups'),
+    'posts:profile': ('posts', 'follows'),
+    'posts:post_detail': ('posts', 'comments', 'groups'),
+}
+# Отдавать вошедшим закэшированные страницы с перерисованными блоками
+PAGE_CACHE_PUNCH = True
+
+# Сжатие ответов: минимальный размер в байтах, уровни gzip и brotli,
+# режим для страниц с CSRF-токеном ('pad', 'skip' или 'off')
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_BREACH_MODE = 'pad'
+
+# Живые комментарии: длительность потока SSE и период проверки базы, сек.
+# Поток держит обработчик, нужны gthread/gevent воркеры; сверх
+# LIVE_COMMENTS_MAX_STREAMS потоков на процесс клиенты переходят на опрос
+LIVE_COMMENTS_TIMEOUT = 60
+LIVE_COMMENTS_POLL_INTERVAL = 5
+LIVE_COMMENTS_MAX_STREAMS = 8
+
+# Период записи накопленных просмотров постов в базу, сек; пишет фоновый
+# поток процесса, остаток записывается при остановке
+VIEW_COUNTS_FLUSH_INTERVAL = 10
+VIEW_COUNTS_BACKGROUND_FLUSH = True
+
+# Профилирование: доля запросов, каталог и период сброса метрик в секундах
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0.01'))
+PROFILING_STORE_DIR = os.path.join(tempfile.gettempdir(), 'yatube-profiling')
+PROFILING_FLUSH_INTERVAL = 10
+
+# Тесты в каждом ядре, у каждого процесса своя база SQLite в памяти
+TEST_RUNNER = 'core.test_runner.ParallelDiscoverRunner'
+
+# Профиль тестов (manage.py test и pytest): стойкость хэшей не нужна,
+# а каждый созданный пользователь иначе тратит десятки миллисекунд.
+# Загрузки идут во временный каталог, который удаляется при выходе
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+if TESTING:
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    # Тесты сбрасывают просмотры сами; atexit записал бы их в рабочую базу
+    VIEW_COUNTS_BACKGROUND_FLUSH = False
+    # Тесты идут с DEBUG=False, но каждый процесс со своим кэшем и базой
+    SILENCED_SYSTEM_CHECKS += ['core.W001']
+    MEDIA_ROOT = tempfile.mkdtemp(prefix='yatube-test-media-')
+    atexit.register(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)